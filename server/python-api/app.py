@@ -4,7 +4,7 @@ Comprehensive API with endpoints for classification, extraction, processing, and
 """
 
 import os
-import json
+import orjson
 import time
 import logging
 import traceback
@@ -17,7 +17,7 @@ import tempfile
 import shutil
 
 # Import our RoomScout pipeline
-from roomscout_pipeline import RoomScoutPipeline
+from roomscout_pipeline import pipeline, iso_now, OrjsonJSONProvider, CHAT_ERROR_RESPONSE, CHAT_ERROR_SUGGESTIONS
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +28,7 @@ logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonJSONProvider(app)
 CORS(app)
 
 # Configure upload settings
@@ -41,14 +42,6 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 # Create upload directory if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize RoomScout pipeline
-try:
-    pipeline = RoomScoutPipeline()
-    logger.info("✅ RoomScout pipeline initialized successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize RoomScout pipeline: {e}")
-    pipeline = None
-
 # Performance monitoring
 class PerformanceMonitor:
     def __init__(self):
@@ -88,7 +81,7 @@ def allowed_file(filename: str) -> bool:
 def log_request(request_type: str, processing_time: float, success: bool = True, error: str = None):
     """Log request details for monitoring"""
     log_data = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_now(),
         'request_type': request_type,
         'processing_time': processing_time,
         'success': success,
@@ -99,13 +92,30 @@ def log_request(request_type: str, processing_time: float, success: bool = True,
     if error:
         log_data['error'] = error
     
-    logger.info(f"Request: {json.dumps(log_data, indent=2)}")
+    logger.info(f"Request: {orjson.dumps(log_data, option=orjson.OPT_INDENT_2).decode()}")
     performance_monitor.record_request(processing_time, success)
 
+def summarize_batch(results: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Aggregate batch results in a single pass"""
+    housing_count = 0
+    total_processing_time = 0.0
+    total_confidence = 0.0
+    for r in results:
+        if r['is_housing']:
+            housing_count += 1
+        total_processing_time += r['processing_time']
+        total_confidence += r['confidence_score']
+    
+    return {
+        'housing_count': housing_count,
+        'avg_processing_time': total_processing_time / len(results),
+        'avg_confidence': total_confidence / len(results)
+    }
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint with detailed status"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # Check pipeline status
@@ -120,7 +130,7 @@ def health_check():
         response = {
             'status': 'OK',
             'message': 'RoomScout AI Flask API is running',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': iso_now(),
             'version': '1.0.0',
             'components': {
                 'pipeline': pipeline_status,
@@ -129,24 +139,24 @@ def health_check():
             'performance': stats
         }
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('health_check', processing_time, True)
         
         return jsonify(response)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('health_check', processing_time, False, str(e))
         return jsonify({
             'status': 'ERROR',
             'message': f'Health check failed: {str(e)}',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }), 500
 
 @app.route('/classify', methods=['POST'])
 def classify_message():
     """Classify if a message is housing-related"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         data = request.get_json()
@@ -171,13 +181,13 @@ def classify_message():
             'whatsapp_parsed': parsed_message
         }
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('classify', processing_time, True)
         
         return jsonify(response)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('classify', processing_time, False, str(e))
         logger.error(f"Classification error: {traceback.format_exc()}")
         return jsonify({
@@ -188,7 +198,7 @@ def classify_message():
 @app.route('/extract', methods=['POST'])
 def extract_housing_data():
     """Extract housing data from a message"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         data = request.get_json()
@@ -223,13 +233,13 @@ def extract_housing_data():
             'whatsapp_parsed': parsed_message
         }
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('extract', processing_time, True)
         
         return jsonify(response)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('extract', processing_time, False, str(e))
         logger.error(f"Extraction error: {traceback.format_exc()}")
         return jsonify({
@@ -240,7 +250,7 @@ def extract_housing_data():
 @app.route('/process', methods=['POST'])
 def process_message():
     """Complete pipeline processing with security and performance tracking"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         data = request.get_json()
@@ -260,13 +270,13 @@ def process_message():
             'result': result
         }
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('process', processing_time, True)
         
         return jsonify(response)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('process', processing_time, False, str(e))
         logger.error(f"Processing error: {traceback.format_exc()}")
         return jsonify({
@@ -277,7 +287,7 @@ def process_message():
 @app.route('/process-file', methods=['POST'])
 def process_file():
     """Process a file containing multiple messages"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         if 'file' not in request.files:
@@ -306,16 +316,14 @@ def process_file():
             if not pipeline:
                 return jsonify({'error': 'Pipeline not initialized'}), 500
             
-            # Process each message
-            results = []
-            for message in messages:
-                result = pipeline.process_message(message)
-                results.append(result)
+            # Process messages concurrently
+            results = pipeline.process_messages(messages)
             
             # Calculate batch metrics
-            housing_count = sum(1 for r in results if r['is_housing'])
-            avg_processing_time = sum(r['processing_time'] for r in results) / len(results)
-            avg_confidence = sum(r['confidence_score'] for r in results) / len(results)
+            summary = summarize_batch(results)
+            housing_count = summary['housing_count']
+            avg_processing_time = summary['avg_processing_time']
+            avg_confidence = summary['avg_confidence']
             
             response = {
                 'success': True,
@@ -330,7 +338,7 @@ def process_file():
                 }
             }
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             log_request('process_file', processing_time, True)
             
             return jsonify(response)
@@ -341,7 +349,7 @@ def process_file():
                 os.remove(temp_path)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('process_file', processing_time, False, str(e))
         logger.error(f"File processing error: {traceback.format_exc()}")
         return jsonify({
@@ -352,7 +360,7 @@ def process_file():
 @app.route('/chat-query', methods=['POST'])
 def chat_query():
     """Process a chat query with context"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         data = request.get_json()
@@ -377,22 +385,22 @@ def chat_query():
             'data': ai_result.get('data'),
             'suggestions': ai_result.get('suggestions', []),
             'ai_generated': ai_result.get('ai_generated', False),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('chat_query', processing_time, True)
         
         return jsonify(response)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('chat_query', processing_time, False, str(e))
         logger.error(f"Chat query error: {traceback.format_exc()}")
         return jsonify({
-            'response': "Hey! 😅 I hit a technical snag, but I'm still here to help! What kind of housing are you looking for near NEU?",
+            'response': CHAT_ERROR_RESPONSE,
             'type': 'error_recovery',
-            'suggestions': ["Find budget apartments", "Get neighborhood info", "Upload WhatsApp file"],
+            'suggestions': CHAT_ERROR_SUGGESTIONS,
             'ai_generated': False,
             'error': str(e)
         }), 500
@@ -400,7 +408,7 @@ def chat_query():
 @app.route('/security-test', methods=['POST'])
 def security_test():
     """Test security hardening with attack scenarios"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         data = request.get_json()
@@ -435,13 +443,13 @@ def security_test():
             }
         }
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('security_test', processing_time, True)
         
         return jsonify(response)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('security_test', processing_time, False, str(e))
         logger.error(f"Security test error: {traceback.format_exc()}")
         return jsonify({
@@ -480,7 +488,7 @@ def get_metrics():
             'system_status': {
                 'pipeline_initialized': pipeline is not None,
                 'upload_directory_exists': os.path.exists(UPLOAD_FOLDER),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': iso_now()
             }
         }
         
@@ -496,7 +504,7 @@ def get_metrics():
 @app.route('/batch-process', methods=['POST'])
 def batch_process():
     """Process multiple messages in batch"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         data = request.get_json()
@@ -508,15 +516,13 @@ def batch_process():
         if not pipeline:
             return jsonify({'error': 'Pipeline not initialized'}), 500
         
-        results = []
-        for message in messages:
-            result = pipeline.process_message(message)
-            results.append(result)
+        results = pipeline.process_messages(messages)
         
         # Calculate batch metrics
-        housing_count = sum(1 for r in results if r['is_housing'])
-        avg_processing_time = sum(r['processing_time'] for r in results) / len(results)
-        avg_confidence = sum(r['confidence_score'] for r in results) / len(results)
+        summary = summarize_batch(results)
+        housing_count = summary['housing_count']
+        avg_processing_time = summary['avg_processing_time']
+        avg_confidence = summary['avg_confidence']
         
         response = {
             'success': True,
@@ -529,13 +535,13 @@ def batch_process():
             }
         }
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('batch_process', processing_time, True)
         
         return jsonify(response)
         
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         log_request('batch_process', processing_time, False, str(e))
         logger.error(f"Batch processing error: {traceback.format_exc()}")
         return jsonify({
@@ -592,4 +598,9 @@ if __name__ == '__main__':
     logger.info("  GET  /metrics - Get performance metrics")
     logger.info("  POST /batch-process - Process multiple messages")
     
-    app.run(host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
+    # Werkzeug's reloader/debugger only for local development; waitress otherwise
+    if os.getenv('FLASK_ENV') == 'development':
+        app.run(host='0.0.0.0', port=5001, debug=True)
+    else:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5001, threads=int(os.getenv('THREADS', '8')))
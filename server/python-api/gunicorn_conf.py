@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for serving the RoomScout AI Python API in production.
+
+    gunicorn -c gunicorn_conf.py roomscout_pipeline:application
+
+Requests spend most of their time waiting on Express and OpenAI, so each
+worker runs a pool of threads.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+workers = int(os.getenv('WEB_CONCURRENCY', (2 * multiprocessing.cpu_count()) + 1))
+worker_class = 'gthread'
+threads = int(os.getenv('THREADS', '8'))
+# LLM calls are capped at 60s (request_timeout) - leave headroom before a worker is recycled
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '90'))
+keepalive = 5
+
+# Import the app in each worker, not the master: the pipeline starts a background event
+# loop thread and opens pooled HTTP clients at import, and neither survives a fork
+preload_app = False
@@ -1,18 +1,32 @@
 import os
-import json
+import copy
+import sys
+import atexit
 import logging
 import time
-import requests
+import hashlib
+import threading
+import functools
+import asyncio
+import httpx
+import orjson
+import tiktoken
 import re
+from enum import Enum
 from typing import Dict, Any, List, Optional, TypedDict
 from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache, LRUCache
 
 # LangChain imports
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.messages import HumanMessage, SystemMessage
 from pydantic import BaseModel, Field
 from langchain_core.runnables import RunnablePassthrough
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.globals import set_llm_cache
 from langchain_core.tracers import LangChainTracer
 from langchain_core.tracers.langchain import wait_for_all_tracers
 
@@ -20,7 +34,8 @@ from langchain_core.tracers.langchain import wait_for_all_tracers
 from langsmith import Client
 
 # Flask imports
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
 # Configure logging
@@ -39,12 +54,83 @@ if LANGSMITH_API_KEY and LANGSMITH_API_KEY.startswith("lsv2_pt_"):
     os.environ["LANGSMITH_TRACING"] = "true"
     os.environ["LANGSMITH_PROJECT"] = "RoomScout-Python-API"
 
+# Express API client - one pooled client so keep-alive connections are reused
+# across requests instead of opening a new TCP connection per call. The transport
+# retries a failed connect once (e.g. a pooled socket the server already closed)
+EXPRESS_API_URL = os.getenv('EXPRESS_API_URL', 'http://localhost:5000')
+express_client = httpx.Client(
+    base_url=EXPRESS_API_URL,
+    timeout=30.0,
+    transport=httpx.HTTPTransport(
+        retries=1,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    )
+)
+atexit.register(express_client.close)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# AI search response cache - identical query/criteria/listings skip the LLM round-trip
+# TTL keeps answers from going stale once the listings behind them change
+search_response_cache = TTLCache(maxsize=2000, ttl=3600)
+cache_lock = threading.Lock()
+
+# Express /api/housing responses keyed by query params - popular searches are repeated across
+# users, and listings change slowly enough that a few minutes of staleness is fine
+housing_api_cache = TTLCache(maxsize=200, ttl=300)
+housing_api_cache_lock = threading.Lock()
+
+# Worker threads for running independent LLM calls concurrently
+llm_executor = ThreadPoolExecutor(max_workers=int(os.getenv('LLM_WORKERS', '8')), thread_name_prefix='llm')
+
+# Worker threads for batch endpoints. Kept separate from llm_executor because process_message
+# waits on llm_executor futures - running batches there could tie up every worker and deadlock
+batch_executor = ThreadPoolExecutor(max_workers=int(os.getenv('BATCH_WORKERS', '8')), thread_name_prefix='batch')
+
+# Persistent event loop for async LLM fan-out. Flask handlers are synchronous, and a
+# loop per request would strand the pooled async connections when it closes.
+# uvloop (libuv-based, not available on Windows) is used for it when installed
+try:
+    import uvloop
+    async_loop = uvloop.new_event_loop()
+except ImportError:
+    async_loop = asyncio.new_event_loop()
+threading.Thread(target=async_loop.run_forever, name='llm-async-loop', daemon=True).start()
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and block until it finishes"""
+    return asyncio.run_coroutine_threadsafe(coro, async_loop).result()
+
+# Async Express client on the shared loop - independent Express lookups are gathered
+# so a request waits for the slowest one instead of the sum of all of them
+express_async_client = httpx.AsyncClient(
+    base_url=EXPRESS_API_URL,
+    timeout=30.0,
+    transport=httpx.AsyncHTTPTransport(
+        retries=1,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    )
+)
+
+# Shared async HTTP client for OpenAI so TLS sessions are reused across concurrent calls
+llm_async_http_client = httpx.AsyncClient(
+    timeout=60.0,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=25)
+)
+BATCH_LLM_CONCURRENCY = int(os.getenv('BATCH_LLM_CONCURRENCY', '20'))
+
 # Initialize LangSmith client
 try:
-    langsmith_client = Client()
-    logger.info('LangSmith client initialized successfully')
+    if LANGSMITH_API_KEY and LANGSMITH_API_KEY != 'your_langsmith_api_key_here':
+        langsmith_client = Client(
+            api_key=LANGSMITH_API_KEY,
+            api_url="https://api.smith.langchain.com"
+        )
+        logger.info("✅ LangSmith client initialized successfully")
+    else:
+        langsmith_client = None
+        logger.info("ℹ️ No LangSmith API key found, tracing disabled")
 except Exception as e:
-    logger.warning(f'LangSmith initialization warning: {e}')
+    logger.warning(f"⚠️ Failed to initialize LangSmith: {e}")
     langsmith_client = None
 
 # Pydantic model from Assignment 6
@@ -58,6 +144,42 @@ class HousingListing(BaseModel):
     additional_notes: Optional[str] = Field(description='Additional details')
     is_housing_related: bool = Field(description='Whether message is housing-related')
 
+# Search query schema - mirrors the criteria the chat search understands, used for structured output
+class BudgetCriteria(BaseModel):
+    min: Optional[int] = Field(default=None, description='Minimum price (for "above $X" or "over $X")')
+    max: Optional[int] = Field(default=None, description='Maximum price (for "below $X" or "under $X")')
+    target: Optional[int] = Field(default=None, description='Target price (for "around $X")')
+    range_type: Optional[str] = Field(default=None, description='"above", "below", "around", "under", "over" or "exact"')
+
+class LocationCriteria(BaseModel):
+    neighborhoods: List[str] = Field(default_factory=list, description='Specific neighborhoods mentioned')
+    proximity: Optional[str] = Field(default=None, description='"near NEU", "close to campus", etc.')
+    city: str = Field(default="Boston", description='City, default Boston')
+
+class RoomTypeCriteria(BaseModel):
+    property_types: List[str] = Field(default_factory=list, description='"apartment", "studio", "house", etc.')
+    bedroom_count: Optional[int] = Field(default=None, description='Number of bedrooms')
+    room_types: List[str] = Field(default_factory=list, description='"shared", "private", "1BR", "2BR", etc.')
+
+class TimelineCriteria(BaseModel):
+    availability: Optional[str] = Field(default=None, description='"now", "immediate", "fall", "september", etc.')
+    start_date: Optional[str] = Field(default=None, description='Requested move-in date')
+
+class SearchCriteria(BaseModel):
+    budget: BudgetCriteria = Field(default_factory=BudgetCriteria)
+    location: LocationCriteria = Field(default_factory=LocationCriteria)
+    room_type: RoomTypeCriteria = Field(default_factory=RoomTypeCriteria)
+    timeline: TimelineCriteria = Field(default_factory=TimelineCriteria)
+    amenities: List[str] = Field(default_factory=list, description='"pet-friendly", "furnished", "parking", etc.')
+    intent: str = Field(default="search", description='"search", "advice" or "information"')
+
+class SearchQuery(BaseModel):
+    """Classified housing query with the search criteria it contains"""
+    query_type: str = Field(description='HOUSING_SEARCH, GENERAL_QUESTION, CONVERSATION or HOUSING_ADVICE')
+    search_criteria: SearchCriteria = Field(description='Search criteria, only filled in for HOUSING_SEARCH')
+    confidence: float = Field(description='Confidence in the classification, 0-1')
+    reasoning: str = Field(description='Brief explanation of classification and extraction')
+
 # State structure for LangGraph workflow
 class GraphState(TypedDict):
     input_text: str
@@ -101,12 +223,15 @@ REMEMBER: You are RoomScout AI. Housing extraction only. No exceptions.
 """
 
 # ENHANCED: Most Comprehensive Housing Relevance Detection Prompt
-CLASSIFICATION_PROMPT = ChatPromptTemplate.from_template("""
+# Prompts are split into a static system block followed by a short human tail holding only
+# the per-request fields, so every call shares a byte-identical prefix for OpenAI prompt caching.
+# The system block is a concrete SystemMessage, so only the human tail is formatted per call
+CLASSIFICATION_PROMPT = ChatPromptTemplate.from_messages([SystemMessage(content="""
 You are RoomScout AI, an expert at determining if queries relate to student housing and living situations.
 
 COMPREHENSIVE HOUSING ECOSYSTEM INCLUDES:
 
-�� **HOUSING SEARCH & LISTINGS:**
+🔍 **HOUSING SEARCH & LISTINGS:**
 - Apartment/room/studio/house searching and availability  
 - Rental listings analysis, evaluation, and comparison
 - Property viewings, virtual tours, and inspections
@@ -210,10 +335,8 @@ COMPREHENSIVE HOUSING ECOSYSTEM INCLUDES:
 - "Tell me about the history of Boston?" → NOT_HOUSING (general knowledge)
 - "What's a good laptop for school?" → NOT_HOUSING (technology purchase)
 
-User query: "{input_text}"
-
 INSTRUCTIONS:
-1. Analyze if this query relates to ANY aspect of the comprehensive housing ecosystem above
+1. Analyze if the user query relates to ANY aspect of the comprehensive housing ecosystem above
 2. Consider if a NEU student might realistically ask this when making housing-related decisions
 3. Be INCLUSIVE of housing-adjacent topics that genuinely affect living and housing choices
 4. Be EXCLUSIVE of general knowledge questions completely unrelated to housing decisions
@@ -224,38 +347,35 @@ INSTRUCTIONS:
 Respond with ONLY:
 - "HOUSING" if related to student housing ecosystem or housing decisions
 - "NOT_HOUSING" if completely unrelated to housing, living, or neighborhood evaluation
+"""), HumanMessagePromptTemplate.from_template("""User query: "{input_text}"
 
-Classification: """)
+Classification: """)])
 
 # FIXED: Enhanced Extraction Prompt with Real Examples
-EXTRACTION_PROMPT = ChatPromptTemplate.from_template("""
-Extract housing information from WhatsApp messages. Here are examples matching real message formats:
-
-Example 1 - Real WhatsApp Format:
-Message: "🏠 *Permanent Accommodation Available!* 1 hall spot in a 3BHK, $575/month + utilities. 1 Cornelia Ct, Boston. 12 mins walk to NEU. DM +1 857-891-9600."
-Output: {{"rent_price": "$575/month", "location": "1 Cornelia Ct, Boston", "room_type": "hall spot", "availability_date": "Available now", "contact_info": "+1 857-891-9600", "gender_preference": null, "additional_notes": "utilities included, 12 mins walk to NEU", "is_housing_related": true}}
-
-Example 2 - Multi-line Format:
-Message: "Permanent Accommodation starting December 16 / January 1st
-Available in a mix gender 3BHK 1.5 bath apartment.
-Rent - $575 p.m + electricity & Wi-Fi
-📍 1 Cornelia Ct (Mission Main Apartments), Boston, MA
-Contact : +1 857-891-9600"
-Output: {{"rent_price": "$575/month", "location": "1 Cornelia Ct (Mission Main Apartments), Boston, MA", "room_type": "3BHK", "availability_date": "December 16 / January 1st", "contact_info": "+1 857-891-9600", "gender_preference": "mix gender", "additional_notes": "electricity & Wi-Fi additional", "is_housing_related": true}}
-
-Example 3 - Non-housing:
-Message: "Good morning everyone! Hope you all had a great weekend!"
-Output: {{"rent_price": null, "location": null, "room_type": null, "availability_date": null, "contact_info": null, "gender_preference": null, "additional_notes": null, "is_housing_related": false}}
-
-Now extract information from this message:
+EXTRACTION_PROMPT = ChatPromptTemplate.from_messages([SystemMessage(content="""
+Extract housing information from WhatsApp messages.
+
+Messages come in real WhatsApp formats - single-line emoji posts such as
+"🏠 *Permanent Accommodation Available!* 1 hall spot in a 3BHK, $575/month + utilities. 1 Cornelia Ct, Boston. 12 mins walk to NEU. DM +1 857-891-9600."
+and multi-line posts with "Rent -", "📍" address and "Contact :" lines.
+
+- rent_price: monthly rent as "$<amount>/month"
+- location: street address or neighborhood as written
+- room_type: e.g. "hall spot", "private room", "3BHK", "studio"
+- availability_date: move-in date as written, "Available now" if immediate
+- contact_info: phone number or handle
+- gender_preference: e.g. "mix gender", "girls only"
+- additional_notes: utilities, distance to NEU and other details
+- is_housing_related: false for greetings and other non-housing messages
+
+Use null for missing information.
+"""), HumanMessagePromptTemplate.from_template("""Now extract information from this message:
 Message: "{input_text}"
 
-IMPORTANT: Return valid JSON even if some fields are missing. Use null for missing information.
-
-Output: """)
+Output: """)])
 
 # ENHANCED: Dynamic AI Knowledge Approach (No Hardcoded Limitations)
-CONVERSATIONAL_CHAT_PROMPT = ChatPromptTemplate.from_template("""
+CONVERSATIONAL_CHAT_PROMPT = ChatPromptTemplate.from_messages([SystemMessage(content="""
 You are RoomScout AI, a knowledgeable housing assistant for Northeastern University students in Boston.
 
 PERSONALITY: 
@@ -287,9 +407,6 @@ DATABASE INTEGRATION:
 - Show real listings with actual prices, locations, and details
 - Calculate group budgets and per-person costs for roommate scenarios
 
-Previous conversation: {context}
-Student's question: "{user_message}"
-
 INSTRUCTIONS:
 - Use your comprehensive Boston knowledge - not just a few predefined neighborhoods
 - For area questions, discuss multiple relevant neighborhoods with their characteristics
@@ -305,14 +422,22 @@ RESPONSE APPROACH:
 - Use database search results to show current availability and pricing
 - Offer practical advice tailored to NEU students' needs and circumstances
 - Be conversational but informative, helpful but not overwhelming
+"""), HumanMessagePromptTemplate.from_template("""Previous conversation: {context}
+Student's question: "{user_message}"
 
-Generate a helpful, comprehensive response using your full Boston knowledge:""")
+Generate a helpful, comprehensive response using your full Boston knowledge:""")])
 
 # NEW: Housing Analysis Prompt - For analyzing shared housing data
-HOUSING_ANALYSIS_PROMPT = ChatPromptTemplate.from_template("""
+HOUSING_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([SystemMessage(content="""
 You are RoomScout AI, analyzing housing information for a NEU student.
 
-Housing data they shared:
+INSTRUCTIONS:
+- Analyze if this is a good deal for NEU students
+- Point out any red flags or great features
+- Give context about the neighborhood if you know it
+- Suggest next steps (questions to ask, things to check)
+- Be encouraging but realistic about Boston housing market
+"""), HumanMessagePromptTemplate.from_template("""Housing data they shared:
 - Price: {price}
 - Location: {location}
 - Room Type: {room_type}
@@ -322,17 +447,10 @@ Housing data they shared:
 
 Original message: "{original_message}"
 
-INSTRUCTIONS:
-- Analyze if this is a good deal for NEU students
-- Point out any red flags or great features
-- Give context about the neighborhood if you know it
-- Suggest next steps (questions to ask, things to check)
-- Be encouraging but realistic about Boston housing market
-
-Provide a helpful analysis as their housing advisor:""")
+Provide a helpful analysis as their housing advisor:""")])
 
 # NEW: Comprehensive Search Query Prompt - AI-powered query parsing
-SEARCH_QUERY_PROMPT = ChatPromptTemplate.from_template("""
+SEARCH_QUERY_PROMPT = ChatPromptTemplate.from_messages([SystemMessage(content="""
 You are RoomScout AI, an expert at understanding housing search queries from natural language.
 
 TASK: Determine if this is a housing search query and extract search criteria.
@@ -354,8 +472,6 @@ EXAMPLES:
 - "I need a studio around $1800" → HOUSING_SEARCH
 - "What neighborhoods are good for students?" → GENERAL_QUESTION
 
-User query: "{user_query}"
-
 INSTRUCTIONS:
 1. FIRST: Classify the query type (HOUSING_SEARCH, GENERAL_QUESTION, CONVERSATION, HOUSING_ADVICE)
 2. ONLY if it's HOUSING_SEARCH: Extract search criteria
@@ -364,50 +480,14 @@ INSTRUCTIONS:
 5. Detect room types and property types mentioned
 6. Note any timeline or availability requirements
 7. Identify amenities or preferences mentioned
+"""), HumanMessagePromptTemplate.from_template("""User query: "{user_query}"
 
-OUTPUT FORMAT:
-{{
-"query_type": "HOUSING_SEARCH|GENERAL_QUESTION|CONVERSATION|HOUSING_ADVICE",
-"search_criteria": {{
-        "budget": {{
-        "min": null,  // minimum price (for "above $X" or "over $X")
-        "max": null,  // maximum price (for "below $X" or "under $X")
-        "target": null,  // target price (for "around $X")
-        "range_type": null  // "above", "below", "around", "under", "over", "exact"
-        }},
-        "location": {{
-        "neighborhoods": [],  // specific neighborhoods mentioned
-        "proximity": null,  // "near NEU", "close to campus", etc.
-        "city": "Boston"  // default to Boston
-        }},
-        "room_type": {{
-        "property_types": [],  // "apartment", "studio", "house", etc.
-        "bedroom_count": null,  // 1, 2, 3, etc.
-        "room_types": []  // "shared", "private", "1BR", "2BR", etc.
-        }},
-        "timeline": {{
-        "availability": null,  // "now", "immediate", "fall", "september", etc.
-        "start_date": null
-        }},
-        "amenities": [],  // "pet-friendly", "furnished", "parking", etc.
-        "intent": "search"  // "search", "advice", "information"
-    }},
-    "confidence": 0.95,
-    "reasoning": "Brief explanation of classification and extraction"
-    }}
-
-Classify and extract:""")
+Classify and extract:""")])
 
 # ENHANCED: Dynamic Search Response with Market Intelligence
-SEARCH_RESPONSE_PROMPT = ChatPromptTemplate.from_template("""
+SEARCH_RESPONSE_PROMPT = ChatPromptTemplate.from_messages([SystemMessage(content="""
 You are RoomScout AI, responding to housing search results with comprehensive market intelligence.
-
-SEARCH CONTEXT:
-- User's query: "{original_query}"
-- Search criteria: {search_criteria}
-- Results found: {result_count}
-- Actual listings: {housing_listings}
-- Market context: Current Boston rental market for students
+Market context: Current Boston rental market for students
 
 INSTRUCTIONS:
 - Analyze the search results in context of the broader Boston market
@@ -424,17 +504,18 @@ RESPONSE STYLE:
 - Provide market context and comparisons
 - Offer practical housing advice
 - End with helpful follow-up questions or suggestions
+"""), HumanMessagePromptTemplate.from_template("""SEARCH CONTEXT:
+- User's query: "{original_query}"
+- Search criteria: {search_criteria}
+- Results found: {result_count}
+- Actual listings: {housing_listings}
 
-Generate an intelligent, comprehensive response about these search results:""")
+Generate an intelligent, comprehensive response about these search results:""")])
 
 # ENHANCED: Database-Aware Neighborhood Analysis Prompt
-NEIGHBORHOOD_ANALYSIS_PROMPT = ChatPromptTemplate.from_template("""
+NEIGHBORHOOD_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([SystemMessage(content="""
 You are RoomScout AI, providing comprehensive neighborhood analysis for NEU students.
 
-Query: "{user_query}"
-Available Listings in Database: {available_listings}
-Current Market Context: {market_data}
-
 INSTRUCTIONS:
 - Use your comprehensive knowledge of Boston neighborhoods
 - Incorporate current database listings to show real availability and pricing
@@ -443,35 +524,669 @@ INSTRUCTIONS:
 - Compare multiple relevant neighborhoods when appropriate
 - Give specific, actionable advice for NEU students
 - Include both lifestyle and practical considerations
+"""), HumanMessagePromptTemplate.from_template("""Query: "{user_query}"
+Available Listings in Database: {available_listings}
+Current Market Context: {market_data}
+
+Generate a comprehensive neighborhood analysis:""")])
+
+# Static response templates - built once at import and filled with str.format_map
+SEARCH_RESULTS_HEADER_TEMPLATE = "🏠 **Found {total} housing option(s) for your search!**\n\n📄 **Page {page} of {total_pages}**\n\n"
+
+NO_SEARCH_RESULTS_TEMPLATE = (
+    "💰 I searched for housing {budget_info}{location_info}, but I couldn't find any current listings matching your criteria.\n\n"
+    "**Here's what you can try:**\n"
+    "• Adjust your budget range\n"
+    "• Try different neighborhoods\n"
+    "• Look for shared rooms or roommate situations\n"
+    "• Check for utilities-included options\n\n"
+    "Want me to search with different criteria?"
+)
+
+# Smart-fallback search criteria - only the budget varies per request, so the empty
+# sections are built once and shared (read-only) by every fallback search
+FALLBACK_SEARCH_CRITERIA = {
+    "location": {
+        "neighborhoods": [],
+        "proximity": None,
+        "city": "Boston"
+    },
+    "room_type": {
+        "property_types": [],
+        "bedroom_count": None,
+        "room_types": []
+    },
+    "timeline": {
+        "availability": None,
+        "start_date": None
+    },
+    "amenities": [],
+    "intent": "search"
+}
+
+CHAT_ERROR_RESPONSE = "Hey! 😅 I hit a technical snag, but I'm still here to help! What kind of housing are you looking for near NEU?"
+CHAT_ERROR_SUGGESTIONS = ["Find budget apartments", "Get neighborhood info", "Upload WhatsApp file"]
+
+# Neighborhoods recognised by keyword query parsing
+DEV_NEIGHBORHOODS = ('Mission Hill', 'Back Bay', 'Fenway', 'Roxbury')
+
+# Greater Boston neighborhoods recognised by the rule-based paths, in priority order
+BOSTON_NEIGHBORHOODS = (
+    'mission hill', 'back bay', 'fenway', 'roxbury', 'jamaica plain', 'cambridge',
+    'somerville', 'allston', 'brighton', 'brookline', 'davis square', 'porter square',
+    'harvard square', 'central square', 'inman square', 'union square', 'assembly square',
+    'medford', 'malden', 'revere', 'quincy', 'dorchester', 'south end', 'north end',
+    'charlestown', 'east boston', 'seaport', 'financial district', 'beacon hill',
+    'south boston', 'west roxbury', 'roslindale', 'hyde park', 'mattapan'
+)
+
+# Smart dev neighborhood replies as (keyword, response, suggestions) - the first keyword in the message wins
+DEV_NEIGHBORHOOD_RESPONSES = (
+    (
+        'mission hill',
+        (
+            "🏃‍♂️ **Mission Hill - The NEU Student Capital!**\n\n"
+            "This is where like 60% of NEU students end up! And for good reason:\n\n"
+            "📍 **8-minute walk to campus** - you can literally roll out of bed to class\n"
+            "💰 **$550-1000** depending on your setup\n"
+            "🍕 **Parker Street** is food heaven (and cheap!)\n"
+            "🚇 **Orange Line** when you want to explore downtown\n\n"
+            "**Real talk**: It gets loud on weekends and parking sucks, but you're in the heart of student life! \n\nWhat matters most to you - being super close to campus or having a quieter spot?"
+        ),
+        ("Find Mission Hill listings", "Compare noise levels", "Get parking info")
+    ),
+    (
+        'back bay',
+        (
+            "🏛️ **Back Bay - Living the Boston Dream!**\n\n"
+            "Gorgeous Victorian brownstones, tree-lined streets - this is postcard Boston! 📸\n\n"
+            "💰 **$1200-2500** (yeah, it's pricey but here's why...)\n"
+            "🍽️ **Incredible restaurants** on every corner\n"
+            "🚇 **Multiple T lines** - you can get anywhere\n"
+            "🏛️ **Safe, beautiful, prestigious**\n\n"
+            "**The trade-off**: You're paying for location and prestige. Worth it if you can swing it! \n\nWhat's your budget looking like? I might know some Back Bay tricks..."
+        ),
+        ("Find Back Bay deals", "Compare costs with other areas", "Get budget strategies")
+    ),
+    (
+        'roxbury',
+        (
+            "🏘️ **Roxbury - Up and Coming!**\n\n"
+            "Roxbury is getting more popular with students for good reasons:\n\n"
+            "💰 **$600-900** - much more affordable than other areas!\n"
+            "🚇 **Orange Line** access to downtown and NEU\n"
+            "🏪 **Dudley Square** has great shopping and food\n"
+            "🌳 **Franklin Park** for outdoor activities\n\n"
+            "**Student vibe**: It's becoming more student-friendly with new developments. Want me to show you some specific Roxbury options?"
+        ),
+        ("Find Roxbury listings", "Learn about Dudley Square", "Get safety info")
+    )
+)
+DEV_NEIGHBORHOOD_DEFAULT_RESPONSE = (
+    "🏠 I see you're interested in Boston neighborhoods! I know all the areas well.\n\n"
+    "**Quick neighborhood guide**:\n"
+    "• **Mission Hill**: Closest to NEU, student central\n"
+    "• **Back Bay**: Upscale, expensive but beautiful\n"
+    "• **Roxbury**: Affordable, up and coming\n"
+    "• **Jamaica Plain**: Artsy, laid-back vibe\n"
+    "• **Allston/Brighton**: College town feel\n\n"
+    "What's most important to you - being close to campus, budget, or neighborhood vibe?"
+)
+DEV_NEIGHBORHOOD_DEFAULT_SUGGESTIONS = ("Find listings in this area", "Compare neighborhoods", "Get budget advice")
+
+# Redirects for common non-housing chat topics - the first entry with a keyword in the message wins
+HOUSING_REDIRECT_RESPONSES = (
+    (('jackfruit', 'fruit'), "🍈 I'm RoomScout AI, focused on Boston housing! While I can't tell you about jackfruit, I can help you find the perfect apartment near NEU. What's your budget for rent? I know great places across all of Boston's neighborhoods! 🏠"),
+    (('pizza',), "🍕 I'm RoomScout AI, your Boston housing expert! While I can't recommend pizza places, I can help you find apartments near great restaurants. What neighborhood are you interested in? Boston has amazing food options everywhere! 🏠"),
+    (('weather',), "🌤️ I'm RoomScout AI, focused on housing! While I can't give weather updates, I can help you find apartments with great heating/cooling systems. What's your budget? I know places that stay comfortable year-round! 🏠"),
+    (('history',), "🏛️ I'm RoomScout AI, your housing specialist! While I can't give history lessons, I can help you find apartments in Boston's historic neighborhoods like Beacon Hill or the North End. What's your budget? 🏠"),
+    (('laptop', 'computer'), "💻 I'm RoomScout AI, focused on housing! While I can't recommend laptops, I can help you find apartments with great internet and study spaces. Many NEU students need quiet places to work - what's your budget? 🏠"),
+    (('job', 'career'), "👔 I'm RoomScout AI, your housing expert! While I can't give career advice, I can help you find apartments near job centers in Boston. What's your budget? I know great places near the Financial District and Seaport! 🏠"),
+    (('sports',), "🏈 I'm RoomScout AI, focused on housing! While I can't give sports updates, I can help you find apartments near Fenway Park or TD Garden. What's your budget? I know great places for sports fans! 🏠"),
+    (('shopping',), "🛍️ I'm RoomScout AI, your housing specialist! While I can't recommend stores, I can help you find apartments near shopping districts like Newbury Street or Assembly Row. What's your budget? 🏠"),
+    (('restaurant',), "🍽️ I'm RoomScout AI, focused on housing! While I can't recommend restaurants, I can help you find apartments in foodie neighborhoods like the North End or South End. What's your budget? 🏠"),
+    (('grocery',), "🛒 I'm RoomScout AI, your housing expert! While I can't recommend grocery stores, I can help you find apartments near supermarkets and farmers markets. What's your budget? I know places near great food options! 🏠"),
+    (('transportation',), "🚇 I'm RoomScout AI, focused on housing! While I can't give transit advice, I can help you find apartments near T stations and bus routes. What's your preferred commute time to NEU? 🏠"),
+    (('fitness', 'gym'), "🏋️‍♂️ I'm RoomScout AI, your housing specialist! While I can't recommend gyms, I can help you find apartments with fitness centers or near gyms. What's your budget? Many buildings have great amenities! 🏠"),
+    (('travel',), "✈️ I'm RoomScout AI, focused on housing! While I can't plan trips, I can help you find apartments near Logan Airport or major transportation hubs. What's your budget? 🏠"),
+    (('dating', 'relationship'), "💑 I'm RoomScout AI, your housing expert! While I can't give dating advice, I can help you find apartments in social neighborhoods with great nightlife. What's your budget? 🏠"),
+    (('music', 'art'), "🎵 I'm RoomScout AI, focused on housing! While I can't recommend music/art venues, I can help you find apartments in cultural neighborhoods like Jamaica Plain or the South End. What's your budget? 🏠"),
+    (('books', 'reading'), "📚 I'm RoomScout AI, your housing specialist! While I can't recommend books, I can help you find apartments near libraries and bookstores. What's your budget? Many places have quiet study spaces! 🏠"),
+    (('news', 'politics'), "📰 I'm RoomScout AI, focused on housing! While I can't give news updates, I can help you find apartments in neighborhoods with great community engagement. What's your budget? 🏠")
+)
+HOUSING_REDIRECT_DEFAULT = "🏠 I'm RoomScout AI, your Boston housing expert! I can help you find apartments, analyze neighborhoods, and give housing advice. What's your budget or preferred neighborhood? I know great places across all of Boston's diverse neighborhoods! 🏠"
+
+# Follow-up suggestions for phrases in an AI chat response, in the order they are offered
+RESPONSE_SUGGESTIONS = (
+    ('mission hill', "Search Mission Hill listings"),
+    ('budget', "Find budget options"),
+    ('roommate', "Get roommate matching help")
+)
+
+# Listing fields drawn from a handful of values - interned when Express responses are cached
+LISTING_INTERNED_FIELDS = ("propertyType", "roomType", "rentType", "status")
+
+# Neighborhoods recognized when saving an extracted listing, as (lowercased, display name)
+LISTING_NEIGHBORHOODS = tuple((name.lower(), name) for name in (
+    "Fenway", "Roxbury", "Dorchester", "Jamaica Plain", "Allston",
+    "Brighton", "Cambridge", "Somerville", "Medford", "Brookline",
+    "Back Bay", "South End", "North End", "Beacon Hill", "Charlestown"
+))
+
+# Words that make the smart dev response try a database search
+SEARCH_QUERY_INDICATORS = (
+    'show me', 'find', 'search', 'looking for', 'need', 'want',
+    'housing', 'apartment', 'room', 'place', 'listing'
+)
+
+# Keyword groups for the rule-based response paths - substring checks against the lowercased message
+BUDGET_WORDS = ('budget', 'cheap', 'affordable', 'under')
+DEV_BUDGET_WORDS = BUDGET_WORDS + ('below',)
+HOUSING_WORDS = ('housing', 'apartment', 'room')
+SIMULATED_SEARCH_WORDS = ('search', 'find', 'looking', 'need', 'want')
+BUDGET_ABOVE_WORDS = ('above', 'over', 'more than')
+BUDGET_BELOW_WORDS = ('below', 'under', 'less than')
+BUDGET_AROUND_WORDS = ('around', 'about', 'approximately')
+
+# Budget qualifiers found in one regex pass - when several appear, above beats below beats around
+BUDGET_QUALIFIER_RANGES = {
+    **dict.fromkeys(BUDGET_ABOVE_WORDS, "above"),
+    **dict.fromkeys(BUDGET_BELOW_WORDS, "below"),
+    **dict.fromkeys(BUDGET_AROUND_WORDS, "around")
+}
+BUDGET_QUALIFIER_RE = re.compile('|'.join(map(re.escape, BUDGET_QUALIFIER_RANGES)))
+# Range type -> budget field it fills, in priority order
+BUDGET_RANGE_FIELDS = {"above": "min", "below": "max", "around": "target"}
+
+class DevIntent(Enum):
+    """Branches of the smart dev response, in priority order"""
+    SEARCH = "search"
+    BUDGET = "budget"
+    NEIGHBORHOOD = "neighborhood"
+    DEFAULT = "default"
+
+def classify_dev_intent(message_lower: str, allow_search: bool = True) -> DevIntent:
+    """Pick the first smart dev response branch whose keywords appear in the message"""
+    if allow_search and any(indicator in message_lower for indicator in SEARCH_QUERY_INDICATORS):
+        return DevIntent.SEARCH
+    if any(word in message_lower for word in DEV_BUDGET_WORDS):
+        return DevIntent.BUDGET
+    if any(hood in message_lower for hood in BOSTON_NEIGHBORHOODS):
+        return DevIntent.NEIGHBORHOOD
+    return DevIntent.DEFAULT
+
+# Keyword classification - one compiled alternation instead of a substring scan per keyword
+HOUSING_KEYWORDS = (
+    'rent', 'apartment', 'room', 'sublet', 'lease', 'housing', 'roommate',
+    'studio', 'bedroom'
+) + BOSTON_NEIGHBORHOODS + (
+    'neu', 'northeastern', 'campus', 'student', 'budget', 'price',
+    'utilities', 'parking', 'transportation', 'commute', 'walk', 'bus', 'train',
+    'safety', 'crime', 'amenities', 'grocery', 'restaurant', 'coffee', 'nightlife'
+)
+HOUSING_KEYWORD_RE = re.compile('|'.join(map(re.escape, HOUSING_KEYWORDS)), re.IGNORECASE)
+
+# Prefilter in front of the LLM classifier: only a message that is nothing but a greeting or
+# small talk is answered locally - every other message, however short, goes to the classifier.
+# Chat small talk is redirected from the local verdict, so it never reaches search-query parsing
+SMALL_TALK_RE = re.compile(
+    r"(?:hi+|hello+|hey+|yo|hiya|howdy|sup|what'?s up|how are you(?: doing)?|how'?s it going"
+    r"|good (?:morning|afternoon|evening)|thanks?(?: you)?(?: so much)?|ok(?:ay)?|cool|bye|goodbye)"
+    r"(?:\s+(?:there|again|roomscout(?: ai)?))?[\s!.?,]*",
+    re.IGNORECASE
+)
+
+# A dollar amount next to a pin or house emoji is a listing post - classified housing without the LLM
+LISTING_PRICE_RE = re.compile(r'\$\s?\d')
+LISTING_MARKER_EMOJIS = ('📍', '🏠')
+
+# First number in a message, with or without a dollar sign, read as a budget
+BUDGET_RE = re.compile(r'\$?(\d+)')
+
+# Listing price with optional thousands separators, e.g. "$1,250/month"
+PRICE_NUMBER_RE = re.compile(r'\$?(\d+(?:,\d{3})*)')
+
+# Smart-fallback check for whether a chat message is worth a database search
+FALLBACK_HOUSING_KEYWORDS = ('rent', 'apartment', 'room', 'housing', 'place', 'home', 'dollar', 'price', 'cost')
+FALLBACK_HOUSING_KEYWORD_RE = re.compile('|'.join(FALLBACK_HOUSING_KEYWORDS), re.IGNORECASE)
+
+# Prompt-injection phrases checked by detect_security_threats
+ATTACK_PATTERNS = (
+    "ignore previous instructions",
+    "you are now",
+    "forget everything",
+    "new instructions",
+    "system prompt"
+)
+ATTACK_PATTERN_RE = re.compile('|'.join(map(re.escape, ATTACK_PATTERNS)), re.IGNORECASE)
+ATTACK_THREATS = {pattern: f"Potential instruction injection: {pattern}" for pattern in ATTACK_PATTERNS}
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Starting point for every rule-based extraction - copying it skips rebuilding the dict
+EMPTY_RULE_EXTRACTION = {
+    "rent_price": None,
+    "location": None,
+    "room_type": None,
+    "availability_date": None,
+    "contact_info": None,
+    "gender_preference": None,
+    "additional_notes": None,
+    "is_housing_related": True
+}
+
+# Rule-based extraction patterns, compiled once - within each field the first match wins
+def _compile_all(patterns) -> tuple:
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+RULE_PRICE_PATTERNS = _compile_all((
+    r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:/month|/mo|per month|p\.m)',
+    r'Rent[:\s-]+\$?(\d+(?:,\d{3})*)',
+    r'\$(\d+(?:,\d{3})*)\s*(?:month|monthly)'
+))
+RULE_LOCATION_PATTERNS = _compile_all((
+    r'📍\s*(?:Location[:\s]*)?([^📍\n]+?)(?:\n|$)',
+    r'Address[:\s]+([^📍\n]+?)(?:\n|$)',
+    r'(\d+\s+[A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Ct|Court|Pl|Place))',
+    r'(Mission Main|Back Bay|Fenway|Brighton|Allston|Jamaica Plain|Roxbury|Cambridge|Somerville|Malden)'
+))
+RULE_ROOM_PATTERNS = _compile_all((
+    r'(\d+\s*(?:hall spot|private room|shared room|bedroom))',
+    r'(hall spot|private room|shared room)',
+    r'(\d+B\d+B|\d+BHK|\d+\s*bed)',
+    r'(studio|apartment)'
+))
+RULE_DATE_PATTERNS = _compile_all((
+    r'(?:starting|available|move-in)[:\s]*([^📍\n]+?)(?:\n|$)',
+    r'(\w+\s+\d+(?:st|nd|rd|th)?,?\s+\d{4})',
+    r'(July|August|September|October|November|December)\s+\d+',
+    r'(\d+(?:st|nd|rd|th)?\s+(?:July|August|September|October|November|December))'
+))
+RULE_CONTACT_PATTERNS = tuple(
+    (pattern, pattern.pattern.startswith(r'\+'))
+    for pattern in _compile_all((
+        r'\+\d{1,3}\s*\(?\d{3}\)?\s*\d{3}[-\s]?\d{4}',
+        r'\+\d{2}\s*\d{5}\s*\d{5}',
+        r'DM[:\s]*([^📍\n]+?)(?:\n|$)',
+        r'Contact[:\s]*([^📍\n]+?)(?:\n|$)'
+    ))
+)
+RULE_GENDER_PATTERNS = _compile_all((
+    r'(all girls?|girls? only|female only)',
+    r'(all boys?|boys? only|male only)',
+    r'(mix gender|mixed gender|mixed-gender)'
+))
+RULE_MAX_NOTES = 3
+RULE_NOTE_PATTERNS = _compile_all((
+    r'(utilities included|utilities[\s\w]*included)',
+    r'(furnished|fully furnished)',
+    r'(vegetarian|veg only|no food preference)',
+    r'(no broker fee|no brokerage)',
+    r'(parking available|parking included)',
+    r'(laundry[\s\w]*building|in-house laundry|in-unit laundry)'
+))
+
+def _prompt_json(value: Any) -> str:
+    """Compact JSON for prompt variables"""
+    return orjson.dumps(value, default=str).decode()
+
+def _intern_listing_fields(listings: List[Dict[str, Any]]):
+    """Intern the small-vocabulary listing fields so cached listings share one copy of each value"""
+    for listing in listings:
+        for field in LISTING_INTERNED_FIELDS:
+            value = listing.get(field)
+            if type(value) is str:
+                listing[field] = sys.intern(value)
+        location = listing.get('location')
+        if isinstance(location, dict) and type(location.get('neighborhood')) is str:
+            location['neighborhood'] = sys.intern(location['neighborhood'])
+
+def _slim_listing(listing: Dict[str, Any]) -> Dict[str, Any]:
+    """The listing fields the search response prompt needs - the same ones the dev template shows"""
+    location = listing.get('location')
+    return {
+        "title": listing.get('title'),
+        "price": listing.get('price'),
+        "neighborhood": location.get('neighborhood') if isinstance(location, dict) else location,
+        "propertyType": listing.get('propertyType'),
+        "bedrooms": listing.get('bedrooms'),
+        "bathrooms": listing.get('bathrooms'),
+        "amenities": listing.get('amenities')
+    }
+
+@functools.lru_cache(maxsize=4096)
+def parse_whatsapp_text(raw_message: str) -> str:
+    """Message text of a WhatsApp export - memoized since groups repost the same message"""
+    # Only the last "<date>, <time> am/pm - <sender>: <text>" line starts the message, so
+    # scan backwards with str.rfind and split just the tail instead of every line of an export
+    text = raw_message.strip()
+    message_content = ""
+    end = len(text)
+    
+    while True:
+        pos = text.rfind(" - ", 0, end)
+        if pos < 0:
+            break
+        start = text.rfind("\n", 0, pos) + 1
+        stop = text.find("\n", pos)
+        if stop < 0:
+            stop = len(text)
+        line = text[start:stop].strip()
+        
+        # Check if this is a timestamp line with phone number
+        if " - " in line and ("am" in line or "pm" in line) and ": " in line:
+            tail = [tail_line.strip() for tail_line in text[stop + 1:].split("\n")] if stop < len(text) else []
+            # Timestamp lines without a sender (system notices) are dropped from the message
+            message_content = "\n".join([line.split(": ", 1)[1]] + [
+                tail_line for tail_line in tail
+                if not (" - " in tail_line and ("am" in tail_line or "pm" in tail_line))
+            ])
+            break
+        end = start
+    
+    if not message_content.strip():
+        message_content = raw_message
+    
+    return message_content.strip()
+
+@functools.lru_cache(maxsize=2)
+def _iso_second(second: int) -> str:
+    return datetime.fromtimestamp(second).isoformat()
+
+def iso_now() -> str:
+    """Current local time in ISO format - formatted once per wall-clock second and shared"""
+    return _iso_second(int(time.time()))
+
+# Conversation context sent with chat prompts - bounded so long sessions don't grow the
+# prompt (and its uncacheable dynamic tail) every turn
+CHAT_CONTEXT_MAX_TURNS = 6
+CHAT_CONTEXT_MAX_CHARS = 2000  # ~500 tokens
+
+def bound_chat_context(context: Any) -> str:
+    """Most recent conversation context: the last CHAT_CONTEXT_MAX_TURNS turns, capped at CHAT_CONTEXT_MAX_CHARS"""
+    if not context:
+        return ""
+    if isinstance(context, list):
+        turns = context[-CHAT_CONTEXT_MAX_TURNS:]
+        context = "\n".join(turn.get("content", "") if isinstance(turn, dict) else str(turn) for turn in turns)
+    elif not isinstance(context, str):
+        context = str(context)
+    return context[-CHAT_CONTEXT_MAX_CHARS:]
+
+# Static system blocks, tokenized once for prompt-size and prompt-cache monitoring
+STATIC_PROMPTS = {
+    "classification": CLASSIFICATION_PROMPT,
+    "extraction": EXTRACTION_PROMPT,
+    "chat": CONVERSATIONAL_CHAT_PROMPT,
+    "analysis": HOUSING_ANALYSIS_PROMPT,
+    "search_query": SEARCH_QUERY_PROMPT,
+    "search_response": SEARCH_RESPONSE_PROMPT,
+    "neighborhood_analysis": NEIGHBORHOOD_ANALYSIS_PROMPT
+}
+OPENAI_PROMPT_CACHE_MIN_TOKENS = 1024
+
+@functools.lru_cache(maxsize=1)
+def _static_prefix_token_counts() -> Dict[str, int]:
+    # Loaded lazily - tiktoken fetches the encoding on first use, which must not block import
+    encoding = tiktoken.encoding_for_model(MODEL_NAME)
+    return {name: len(encoding.encode(prompt.messages[0].content)) for name, prompt in STATIC_PROMPTS.items()}
 
-Generate a comprehensive neighborhood analysis:""")
+def static_prefix_token_stats() -> Dict[str, Any]:
+    """Token length of each static prompt prefix and whether it is long enough for OpenAI prompt caching"""
+    try:
+        counts = _static_prefix_token_counts()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not tokenize static prompts: {e}")
+        return {}
+    return {
+        name: {"prefix_len_tokens": count, "prompt_cacheable": count >= OPENAI_PROMPT_CACHE_MIN_TOKENS}
+        for name, count in counts.items()
+    }
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes jsonify responses and parses request bodies with orjson.
+    Keys stay sorted and dates go through Flask's default handler, so payloads match the stdlib
+    provider apart from non-ASCII text being sent as UTF-8 instead of \\u escapes.
+    """
+    
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE
+    
+    def response(self, *args, **kwargs) -> Response:
+        # Pretty-printed (debug) output stays on the stdlib encoder
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self.option)
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+    
+    def dumps(self, obj: Any, **kwargs) -> str:
+        # Explicit json.dumps arguments (indent, ensure_ascii, ...) need the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self.option & ~orjson.OPT_APPEND_NEWLINE).decode()
+        except TypeError:
+            return super().dumps(obj)
+    
+    def loads(self, s, **kwargs) -> Any:
+        return orjson.loads(s)
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonJSONProvider(app)
 CORS(app)
 
-# Initialize LangChain components with token optimization
-# Use gpt-3.5-turbo for development to save tokens
-MODEL_NAME = "gpt-3.5-turbo"
+class PromptCacheUsageHandler(BaseCallbackHandler):
+    """Totals token usage (including OpenAI prompt-cache reads) across every LLM call"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.cache_write_prompt_tokens = 0
+        self.llm_calls = 0
+    
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.record(usage)
+    
+    def record(self, usage: Dict[str, Any]):
+        """Accumulate prompt tokens per call, how many were read from the provider's prompt cache and how many were written to it"""
+        token_details = usage.get("input_token_details") or {}
+        cache_read = token_details.get("cache_read") or 0
+        with self.lock:
+            self.prompt_tokens += usage.get("input_tokens", 0)
+            self.cached_prompt_tokens += cache_read
+            self.cache_write_prompt_tokens += token_details.get("cache_creation") or 0
+            self.llm_calls += 1
+        if cache_read:
+            logger.info(f"⚡ Prompt cache hit: {cache_read}/{usage.get('input_tokens', 0)} input tokens")
+    
+    def totals(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "prompt_tokens": self.prompt_tokens,
+                "cached_prompt_tokens": self.cached_prompt_tokens,
+                "cache_write_prompt_tokens": self.cache_write_prompt_tokens,
+                "llm_calls": self.llm_calls,
+                "avg_input_tokens": round(self.prompt_tokens / self.llm_calls, 1) if self.llm_calls else 0
+            }
+
+token_usage_handler = PromptCacheUsageHandler()
 
-# Check if OpenAI API key is available
-if not OPENAI_API_KEY:
-    logger.error("OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
+# Initialize LangChain components with token optimization
+# gpt-4o-mini is cheaper than gpt-3.5-turbo and supports OpenAI's automatic prompt caching,
+# so the static system prefixes above are billed at the cached rate on repeat requests
+MODEL_NAME = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+
+# One client and one set of chains per process - ChatOpenAI sets up its own HTTP
+# clients, so building it per pipeline instance repeats that work for nothing
+if not OPENAI_API_KEY or OPENAI_API_KEY in ('your_openai_api_key_here', 'sk-placeholder'):
+    logger.warning("❌ No valid OpenAI API key found - AI features will be limited")
     logger.info("For development, set DEVELOPMENT_MODE=true to use simulated responses.")
     llm = None
 else:
     try:
+        # Imported only when there is a key to use it - langchain_openai pulls in the whole
+        # openai SDK, about a second of cold start that keyless dev runs never need
+        from langchain_openai import ChatOpenAI
         llm = ChatOpenAI(
             model=MODEL_NAME,
-            temperature=0.1,
+            temperature=0.7,
             max_tokens=500,  # Reduced from 1000 to save tokens
-            request_timeout=60  # Increased timeout to 60 seconds
+            request_timeout=60,
+            http_async_client=llm_async_http_client,
+            callbacks=[token_usage_handler]
         )
-        logger.info(f"Using model: {MODEL_NAME}")
+        logger.info(f"✅ OpenAI configured successfully with model: {MODEL_NAME}")
     except Exception as e:
-        logger.error(f"Failed to initialize OpenAI client: {e}")
+        logger.error(f"❌ Failed to initialize OpenAI client: {e}")
         llm = None
 
+# Response cache in front of every LLM call, keyed on prompt, model and params - repeated
+# chat messages and reposted listings are answered from SQLite instead of OpenAI.
+# Every gunicorn worker opens the same file: WAL mode lets workers read while one writes,
+# and busy_timeout makes a concurrent writer wait for the lock instead of failing
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', str(Path(__file__).resolve().parent / '.roomscout_llm_cache.db'))
+
+if llm is not None:
+    try:
+        from langchain_community.cache import SQLAlchemyCache
+        from sqlalchemy import create_engine, event
+        
+        llm_cache_engine = create_engine(f"sqlite:///{LLM_CACHE_PATH}")
+        
+        @event.listens_for(llm_cache_engine, "connect")
+        def _configure_llm_cache_connection(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA journal_mode=WAL")
+            dbapi_connection.execute("PRAGMA busy_timeout=5000")
+        
+        set_llm_cache(SQLAlchemyCache(llm_cache_engine))
+        logger.info(f"✅ LLM response cache enabled at {LLM_CACHE_PATH}")
+    except ImportError:
+        logger.warning("⚠️ langchain-community not installed - LLM response cache disabled")
+    except Exception as e:
+        # Two workers creating the cache table at the same moment can collide - run uncached
+        logger.warning(f"⚠️ LLM response cache unavailable: {e}")
+
+# Explicit cache breakpoints for Anthropic models served through an OpenAI-compatible proxy
+# (e.g. LiteLLM at OPENAI_BASE_URL). OpenAI caches prefixes automatically and doesn't expect
+# the extra field, so this stays opt-in
+PROMPT_CACHING_OPTIMIZATION = os.getenv('PROMPT_CACHING_OPTIMIZATION', 'false').lower() == 'true'
+
+# Start extraction alongside the LLM classification so a housing message waits for one round-trip
+# instead of two. Every non-housing message that reaches the classifier then pays for an extraction
+# call too, so it stays opt-in
+SPECULATIVE_EXTRACTION = os.getenv('SPECULATIVE_EXTRACTION', 'false').lower() == 'true'
+
+def _chain_prompt(prompt: ChatPromptTemplate) -> ChatPromptTemplate:
+    """The prompt as sent to the model - the static system block gets an ephemeral cache_control marker when enabled"""
+    if not PROMPT_CACHING_OPTIMIZATION:
+        return prompt
+    system_message, *dynamic_messages = prompt.messages
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=[{"type": "text", "text": system_message.content, "cache_control": {"type": "ephemeral"}}]),
+        *dynamic_messages
+    ])
+
+# Classification runs for every chat query and pipeline message, so it calls the model
+# directly instead of through a prompt | llm | parser sequence: the system message is
+# built once and only the short user tail is formatted per call
+CLASSIFICATION_SYSTEM_MESSAGE = _chain_prompt(CLASSIFICATION_PROMPT).messages[0]
+CLASSIFICATION_USER_TEMPLATE = CLASSIFICATION_PROMPT.messages[1].prompt.template
+
+def classification_messages(message: str) -> List[Any]:
+    return [CLASSIFICATION_SYSTEM_MESSAGE, HumanMessage(content=CLASSIFICATION_USER_TEMPLATE.format(input_text=message))]
+
+# The classifier only ever answers HOUSING or NOT_HOUSING, so its calls are capped at a few
+# output tokens and run at temperature 0 instead of sharing the 500-token chat settings
+CLASSIFICATION_MAX_TOKENS = 5
+classification_llm = llm.bind(max_tokens=CLASSIFICATION_MAX_TOKENS, temperature=0) if llm is not None else None
+
+if llm is not None:
+    # Native function calling against the pydantic schemas - no JSON boilerplate in the
+    # prompt or output. JSON schemas (not the classes) keep partial dicts streaming
+    extraction_chain = _chain_prompt(EXTRACTION_PROMPT) | llm.with_structured_output(
+        HousingListing.model_json_schema(), method="function_calling"
+    )
+    
+    chat_chain = _chain_prompt(CONVERSATIONAL_CHAT_PROMPT) | llm | StrOutputParser()
+    analysis_chain = _chain_prompt(HOUSING_ANALYSIS_PROMPT) | llm | StrOutputParser()
+    search_query_chain = _chain_prompt(SEARCH_QUERY_PROMPT) | llm.with_structured_output(
+        SearchQuery.model_json_schema(), method="function_calling"
+    )
+    search_response_chain = _chain_prompt(SEARCH_RESPONSE_PROMPT) | llm | StrOutputParser()
+else:
+    extraction_chain = None
+    chat_chain = None
+    analysis_chain = None
+    search_query_chain = None
+    search_response_chain = None
+
+class MessageResultCache:
+    """
+    Bounded LRU of pipeline results keyed by the SHA-256 of the normalized message text,
+    so reposted or forwarded WhatsApp messages reuse the earlier LLM result without the
+    cache holding a copy of every message. Values are deep-copied in and out, so callers
+    can mutate what they get back.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        self.cache = LRUCache(maxsize=maxsize)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _key(self, message: str) -> bytes:
+        return hashlib.sha256(WHITESPACE_RE.sub(' ', message.strip().lower()).encode()).digest()
+    
+    def get(self, message: str) -> Any:
+        """Cached result for the message, or None (counted as a miss)"""
+        with self.lock:
+            cached = self.cache.get(self._key(message))
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(cached)
+    
+    def put(self, message: str, result: Any):
+        cached = copy.deepcopy(result)
+        with self.lock:
+            self.cache[self._key(message)] = cached
+    
+    def __contains__(self, message: str) -> bool:
+        with self.lock:
+            return self._key(message) in self.cache
+    
+    def get_or_compute(self, message: str, compute, cacheable=None) -> Any:
+        result = self.get(message)
+        if result is not None:
+            return result
+        
+        result = compute(message)
+        if cacheable is None or cacheable(result):
+            self.put(message, result)
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.cache),
+                "maxsize": self.cache.maxsize
+            }
+
 class RoomScoutPipeline:
     """
     RoomScout AI Pipeline for processing housing-related messages
@@ -480,66 +1195,31 @@ class RoomScoutPipeline:
     """
     
     def __init__(self):
-        # Initialize OpenAI client properly
-        try:
-            if os.getenv('OPENAI_API_KEY') and os.getenv('OPENAI_API_KEY') != 'your_openai_api_key_here' and os.getenv('OPENAI_API_KEY') != 'sk-placeholder':
-                self.llm = ChatOpenAI(
-                    model_name=MODEL_NAME,
-                    temperature=0.7,
-                    max_tokens=500,
-                    openai_api_key=os.getenv('OPENAI_API_KEY')
-                )
-                logger.info(f"✅ OpenAI configured successfully with model: {MODEL_NAME}")
-                self.ai_available = True
-            else:
-                self.llm = None
-                self.ai_available = False
-                logger.warning("❌ No valid OpenAI API key found - AI features will be limited")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize OpenAI client: {e}")
-            self.llm = None
-            self.ai_available = False
-        
-        # Initialize LangSmith client
-        try:
-            if os.getenv('LANGSMITH_API_KEY') and os.getenv('LANGSMITH_API_KEY') != 'your_langsmith_api_key_here':
-                langsmith_client = Client(
-                    api_key=os.getenv('LANGSMITH_API_KEY'),
-                    api_url="https://api.smith.langchain.com"
-                )
-                logger.info("✅ LangSmith client initialized successfully")
-            else:
-                logger.info("ℹ️ No LangSmith API key found, tracing disabled")
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to initialize LangSmith: {e}")
+        # Shared module-level client and chains - nothing is rebuilt per instance
+        self.llm = llm
+        self.classification_llm = classification_llm
+        self.ai_available = llm is not None
         
-        # FIXED: Initialize AI chains with robust error handling
-        if self.ai_available and self.llm:
-            logger.info("🤖 Initializing AI chains with LangChain...")
-            self.classification_chain = CLASSIFICATION_PROMPT | self.llm
-            
-            # FIXED: Use JsonOutputParser directly (OutputFixingParser not available in this version)
-            from langchain_core.output_parsers import JsonOutputParser
-            self.extraction_chain = EXTRACTION_PROMPT | self.llm | JsonOutputParser()
-            
-            self.chat_chain = CONVERSATIONAL_CHAT_PROMPT | self.llm
-            self.analysis_chain = HOUSING_ANALYSIS_PROMPT | self.llm
-            self.search_query_chain = SEARCH_QUERY_PROMPT | self.llm | JsonOutputParser()
-            self.search_response_chain = SEARCH_RESPONSE_PROMPT | self.llm
-            logger.info("✅ All AI chains initialized with robust error handling")
+        if self.ai_available:
+            logger.info("🤖 Using shared AI chains")
         else:
             logger.warning("⚠️ AI chains not available - system will use enhanced fallbacks")
-            self.classification_chain = None
-            self.extraction_chain = None
-            self.chat_chain = None
-            self.analysis_chain = None
-            self.search_query_chain = None
-            self.search_response_chain = None
+        self.extraction_chain = extraction_chain
+        self.chat_chain = chat_chain
+        self.analysis_chain = analysis_chain
+        self.search_query_chain = search_query_chain
+        self.search_response_chain = search_response_chain
         
         # Initialize development mode
         self.development_mode = os.getenv('DEVELOPMENT_MODE', 'false').lower() == 'true'
         
-        # Initialize metrics
+        # Result caches keyed by normalized message text
+        self.classification_cache = MessageResultCache()
+        self.extraction_cache = MessageResultCache()
+        self.search_query_cache = MessageResultCache()
+        
+        # Initialize metrics - updated under a lock since Flask serves requests on threads
+        self.metrics_lock = threading.Lock()
         self.metrics = {
             "total_requests": 0,
             "successful_requests": 0,
@@ -550,67 +1230,49 @@ class RoomScoutPipeline:
             "last_request_time": None
         }
     
+    def record_request(self, success: bool = True, ai_generated: bool = False):
+        """Record one chat request in the metrics under a single lock"""
+        with self.metrics_lock:
+            self.metrics["total_requests"] += 1
+            if success:
+                self.metrics["successful_requests"] += 1
+                self.metrics["ai_requests" if ai_generated else "fallback_requests"] += 1
+                self.metrics["last_request_time"] = iso_now()
+            else:
+                self.metrics["failed_requests"] += 1
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Consistent copy of the metrics for reporting"""
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        metrics.update(token_usage_handler.totals())
+        return metrics
+    
     def parse_whatsapp_message(self, raw_message: str) -> Dict[str, Any]:
         """Extract message content after phone number in WhatsApp format"""
         try:
-            lines = raw_message.strip().split('\n')
-            message_content = ""
-            found_message_start = False
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    if found_message_start:
-                        message_content += "\n"
-                    continue
-                    
-                # Check if this is a timestamp line with phone number
-                if " - " in line and ("am" in line or "pm" in line):
-                    if ": " in line:
-                        parts = line.split(": ", 1)
-                        if len(parts) > 1:
-                            message_content = parts[1]
-                            found_message_start = True
-                            continue
-                elif found_message_start:
-                    message_content += "\n" + line
-                elif "joined using" in line or "changed to" in line or "created group" in line:
-                    continue
-            
-            if not message_content.strip():
-                message_content = raw_message
-            
-            return {
-                "original": raw_message,
-                "parsed": message_content.strip(),
-                "timestamp": datetime.now().isoformat()
-            }
+            parsed = parse_whatsapp_text(raw_message)
         except Exception as e:
             logger.error(f"Error parsing WhatsApp message: {e}")
-            return {
-                "original": raw_message,
-                "parsed": raw_message,
-                "timestamp": datetime.now().isoformat()
-            }
+            parsed = raw_message
+        
+        return {
+            "original": raw_message,
+            "parsed": parsed,
+            "timestamp": iso_now()
+        }
     
     def detect_security_threats(self, message: str) -> Dict[str, Any]:
         """
         Security threat detection from Assignment 8
         """
-        threats = []
-        
-        # Check for common attack patterns
-        attack_patterns = [
-            "ignore previous instructions",
-            "you are now",
-            "forget everything",
-            "new instructions",
-            "system prompt"
-        ]
+        # Check for common attack patterns in a single pass
+        found = ATTACK_PATTERN_RE.findall(message)
+        if not found:
+            return {"threats_detected": False, "threats": [], "security_status": "SECURE"}
         
-        for pattern in attack_patterns:
-            if pattern.lower() in message.lower():
-                threats.append(f"Potential instruction injection: {pattern}")
+        found = {match.lower() for match in found}
+        threats = [threat for pattern, threat in ATTACK_THREATS.items() if pattern in found]
         
         return {
             "threats_detected": len(threats) > 0,
@@ -618,78 +1280,195 @@ class RoomScoutPipeline:
             "security_status": "COMPROMISED" if threats else "SECURE"
         }
     
+    def _is_small_talk(self, message: str) -> bool:
+        """True when a message is nothing but a greeting or small talk - not worth an LLM classification"""
+        return SMALL_TALK_RE.fullmatch(message.strip()) is not None
+    
+    def _needs_llm_classification(self, message: str) -> bool:
+        """True when classifying the message will wait on the LLM - no cached or local verdict"""
+        return (self.llm is not None and self.extraction_chain is not None
+                and message not in self.classification_cache
+                and self._classify_without_llm(message) is None)
+    
+    def _has_listing_markers(self, message: str) -> bool:
+        """True for WhatsApp listing posts - a dollar amount alongside a pin or house emoji"""
+        return any(emoji in message for emoji in LISTING_MARKER_EMOJIS) and LISTING_PRICE_RE.search(message) is not None
+    
     def classify_message(self, message: str) -> Dict[str, Any]:
         """
         Classify if message is housing-related using comprehensive AI analysis
         """
+        return self.classification_cache.get_or_compute(
+            message,
+            self._classify_message,
+            cacheable=self._is_cacheable_classification
+        )
+    
+    def _is_cacheable_classification(self, result: Dict[str, Any]) -> bool:
+        return result.get("classification_method") != "error"
+    
+    def _classify_message(self, message: str) -> Dict[str, Any]:
         try:
-            # Always try AI first
-            if self.llm:
-                security_check = self.detect_security_threats(message)
-                if security_check["threats_detected"]:
-                    return {
-                        "is_housing": False,
-                        "reasoning": "Security threat detected - message rejected",
-                        "security_status": "COMPROMISED"
-                    }
-                
-                response = self.classification_chain.invoke({"input_text": message})
-                # Handle the new comprehensive response format
-                response_text = response.content.strip().upper()
-                is_housing = "HOUSING" in response_text and "NOT_HOUSING" not in response_text
-                
+            local_result = self._classify_without_llm(message)
+            if local_result is not None:
+                return local_result
+            
+            response = self.classification_llm.invoke(classification_messages(message))
+            return self._ai_classification_result(response.content)
+        except Exception as e:
+            return self._classification_error(e)
+    
+    async def abatch_classify_messages(self, messages: List[str]) -> List[Dict[str, Any]]:
+        """Classify many messages with one abatch call, at most BATCH_LLM_CONCURRENCY LLM calls in flight"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        pending = []
+        
+        for i, message in enumerate(messages):
+            result = self.classification_cache.get(message)
+            if result is None:
+                try:
+                    result = self._classify_without_llm(message)
+                except Exception as e:
+                    result = self._classification_error(e)
+            if result is None:
+                pending.append(i)
+            else:
+                results[i] = result
+        
+        if pending:
+            responses = await self.classification_llm.abatch(
+                [classification_messages(messages[i]) for i in pending],
+                config={"max_concurrency": BATCH_LLM_CONCURRENCY},
+                return_exceptions=True
+            )
+            for i, response in zip(pending, responses):
+                if isinstance(response, Exception):
+                    results[i] = self._classification_error(response)
+                else:
+                    results[i] = self._ai_classification_result(response.content)
+        
+        for message, result in zip(messages, results):
+            if self._is_cacheable_classification(result):
+                self.classification_cache.put(message, result)
+        return results
+    
+    def _classify_without_llm(self, message: str) -> Optional[Dict[str, Any]]:
+        """Classification that needs no LLM call - None when the message has to go to the classifier"""
+        # With AI available only rejected and obviously non-housing messages are answered locally
+        if self.llm:
+            security_check = self.detect_security_threats(message)
+            if security_check["threats_detected"]:
+                return {
+                    "is_housing": False,
+                    "reasoning": "Security threat detected - message rejected",
+                    "security_status": "COMPROMISED"
+                }
+            
+            # Pure greetings and small talk ("Hi", "Thanks!") skip the LLM
+            if self._is_small_talk(message):
                 return {
-                    "is_housing": is_housing,
-                    "reasoning": response.content,
+                    "is_housing": False,
+                    "reasoning": "Small-talk prefilter - greeting with no housing content",
                     "security_status": "SECURE",
-                    "classification_method": "comprehensive_ai_analysis"
+                    "classification_method": "small_talk_prefilter"
                 }
-            else:
-                # Enhanced keyword-based classification if no AI
-                housing_keywords = [
-                    'rent', 'apartment', 'room', 'sublet', 'lease', 'housing', 'roommate', 
-                    'studio', 'bedroom', 'mission hill', 'back bay', 'fenway', 'roxbury', 
-                    'jamaica plain', 'cambridge', 'somerville', 'allston', 'brighton', 
-                    'brookline', 'davis square', 'porter square', 'harvard square', 
-                    'central square', 'inman square', 'union square', 'assembly square',
-                    'medford', 'malden', 'revere', 'quincy', 'dorchester', 'south end',
-                    'north end', 'charlestown', 'east boston', 'seaport', 'financial district',
-                    'beacon hill', 'south boston', 'west roxbury', 'roslindale', 'hyde park',
-                    'mattapan', 'neu', 'northeastern', 'campus', 'student', 'budget', 'price',
-                    'utilities', 'parking', 'transportation', 'commute', 'walk', 'bus', 'train',
-                    'safety', 'crime', 'amenities', 'grocery', 'restaurant', 'coffee', 'nightlife'
-                ]
-                is_housing = any(keyword in message.lower() for keyword in housing_keywords)
-                
+            
+            if self._has_listing_markers(message):
                 return {
-                    "is_housing": is_housing,
-                    "reasoning": "Enhanced keyword-based classification (no AI available)",
+                    "is_housing": True,
+                    "reasoning": "Listing markers - price with location emoji",
                     "security_status": "SECURE",
-                    "classification_method": "enhanced_keyword_matching"
+                    "classification_method": "listing_markers"
                 }
-        except Exception as e:
-            logger.error(f"Error in classification: {e}")
+            
+            return None
+        else:
+            # Enhanced keyword-based classification if no AI
+            is_housing = HOUSING_KEYWORD_RE.search(message) is not None
+            
             return {
-                "is_housing": False,
-                "reasoning": f"Error during classification: {str(e)}",
-                "security_status": "ERROR",
-                "classification_method": "error"
+                "is_housing": is_housing,
+                "reasoning": "Enhanced keyword-based classification (no AI available)",
+                "security_status": "SECURE",
+                "classification_method": "enhanced_keyword_matching"
             }
     
+    def _ai_classification_result(self, response: str) -> Dict[str, Any]:
+        # Handle the new comprehensive response format
+        response_text = response.strip().upper()
+        is_housing = "HOUSING" in response_text and "NOT_HOUSING" not in response_text
+        
+        return {
+            "is_housing": is_housing,
+            "reasoning": response,
+            "security_status": "SECURE",
+            "classification_method": "comprehensive_ai_analysis"
+        }
+    
+    def _classification_error(self, error: Exception) -> Dict[str, Any]:
+        logger.error(f"Error in classification: {error}")
+        return {
+            "is_housing": False,
+            "reasoning": f"Error during classification: {str(error)}",
+            "security_status": "ERROR",
+            "classification_method": "error"
+        }
+    
     def extract_housing_data(self, message: str, use_cot: bool = False) -> Dict[str, Any]:
-        try:
+        # Rule-based results are only cached when there is no AI, so a transient
+        # AI failure doesn't pin the fallback extraction for that message
+        return self.extraction_cache.get_or_compute(
+            message,
+            self._extract_housing_data,
+            cacheable=self._is_cacheable_extraction
+        )
+    
+    def _is_cacheable_extraction(self, result: Dict[str, Any]) -> bool:
+        return result["extraction_method"] == "ai_extraction" or not self.llm
+    
+    async def abatch_extract_housing_data(self, messages: List[str]) -> List[Dict[str, Any]]:
+        """Extract many messages concurrently, at most BATCH_LLM_CONCURRENCY LLM calls in flight"""
+        semaphore = asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+        
+        async def extract_one(message: str) -> Dict[str, Any]:
+            cached = self.extraction_cache.get(message)
+            if cached is not None:
+                return cached
+            
+            ai_response = None
             if self.llm and self.extraction_chain:
                 try:
-                    response = self.extraction_chain.invoke({"input_text": message})
-                    if isinstance(response, dict) and (response.get("rent_price") or response.get("location")):
-                        return {
-                            "extracted_data": response,
-                            "confidence_score": 0.9,
-                            "extraction_method": "ai_extraction"
-                        }
+                    async with semaphore:
+                        ai_response = await self.extraction_chain.ainvoke({"input_text": message})
                 except Exception as e:
                     logger.error(f"AI extraction failed: {e}")
             
+            result = self._build_extraction_result(message, ai_response)
+            if self._is_cacheable_extraction(result):
+                self.extraction_cache.put(message, result)
+            return result
+        
+        return await asyncio.gather(*(extract_one(message) for message in messages))
+    
+    def _extract_housing_data(self, message: str) -> Dict[str, Any]:
+        ai_response = None
+        if self.llm and self.extraction_chain:
+            try:
+                ai_response = self._stream_json_chain(self.extraction_chain, {"input_text": message})
+            except Exception as e:
+                logger.error(f"AI extraction failed: {e}")
+        return self._build_extraction_result(message, ai_response)
+    
+    def _build_extraction_result(self, message: str, ai_response: Any) -> Dict[str, Any]:
+        """Use the AI extraction if it found a price or location, otherwise extract rule-based"""
+        try:
+            if isinstance(ai_response, dict) and (ai_response.get("rent_price") or ai_response.get("location")):
+                return {
+                    "extracted_data": ai_response,
+                    "confidence_score": 0.9,
+                    "extraction_method": "ai_extraction"
+                }
+            
             # Rule-based fallback
             extracted_data = self._robust_rule_based_extraction(message)
             return {
@@ -709,111 +1488,59 @@ class RoomScoutPipeline:
         """
         FIXED: Robust rule-based extraction that handles real WhatsApp formats
         """
-        import re
-        
-        extracted = {
-            "rent_price": None,
-            "location": None,
-            "room_type": None,
-            "availability_date": None,
-            "contact_info": None,
-            "gender_preference": None,
-            "additional_notes": None,
-            "is_housing_related": True
-        }
+        extracted = EMPTY_RULE_EXTRACTION.copy()
         
         # Enhanced price extraction
-        price_patterns = [
-            r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:/month|/mo|per month|p\.m)',
-            r'Rent[:\s-]+\$?(\d+(?:,\d{3})*)',
-            r'\$(\d+(?:,\d{3})*)\s*(?:month|monthly)'
-        ]
-        for pattern in price_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in RULE_PRICE_PATTERNS:
+            match = pattern.search(message)
             if match:
                 extracted["rent_price"] = f"${match.group(1)}/month"
                 break
         
         # Enhanced location extraction
-        location_patterns = [
-            r'📍\s*(?:Location[:\s]*)?([^📍\n]+?)(?:\n|$)',
-            r'Address[:\s]+([^📍\n]+?)(?:\n|$)',
-            r'(\d+\s+[A-Za-z\s]+(?:St|Street|Ave|Avenue|Rd|Road|Ct|Court|Pl|Place))',
-            r'(Mission Main|Back Bay|Fenway|Brighton|Allston|Jamaica Plain|Roxbury|Cambridge|Somerville|Malden)'
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in RULE_LOCATION_PATTERNS:
+            match = pattern.search(message)
             if match:
                 extracted["location"] = match.group(1).strip()
                 break
         
         # Enhanced room type extraction
-        room_patterns = [
-            r'(\d+\s*(?:hall spot|private room|shared room|bedroom))',
-            r'(hall spot|private room|shared room)',
-            r'(\d+B\d+B|\d+BHK|\d+\s*bed)',
-            r'(studio|apartment)'
-        ]
-        for pattern in room_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in RULE_ROOM_PATTERNS:
+            match = pattern.search(message)
             if match:
                 extracted["room_type"] = match.group(1).strip()
                 break
         
         # Enhanced date extraction
-        date_patterns = [
-            r'(?:starting|available|move-in)[:\s]*([^📍\n]+?)(?:\n|$)',
-            r'(\w+\s+\d+(?:st|nd|rd|th)?,?\s+\d{4})',
-            r'(July|August|September|October|November|December)\s+\d+',
-            r'(\d+(?:st|nd|rd|th)?\s+(?:July|August|September|October|November|December))'
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in RULE_DATE_PATTERNS:
+            match = pattern.search(message)
             if match:
                 extracted["availability_date"] = match.group(1).strip()
                 break
         
-        # Enhanced contact extraction
-        contact_patterns = [
-            r'\+\d{1,3}\s*\(?\d{3}\)?\s*\d{3}[-\s]?\d{4}',
-            r'\+\d{2}\s*\d{5}\s*\d{5}',
-            r'DM[:\s]*([^📍\n]+?)(?:\n|$)',
-            r'Contact[:\s]*([^📍\n]+?)(?:\n|$)'
-        ]
-        for pattern in contact_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        # Enhanced contact extraction - phone numbers are the whole match, labels capture what follows
+        for pattern, whole_match in RULE_CONTACT_PATTERNS:
+            match = pattern.search(message)
             if match:
-                extracted["contact_info"] = match.group().strip() if pattern.startswith(r'\+') else match.group(1).strip()
+                extracted["contact_info"] = match.group().strip() if whole_match else match.group(1).strip()
                 break
         
         # Enhanced gender preference extraction  
-        gender_patterns = [
-            r'(all girls?|girls? only|female only)',
-            r'(all boys?|boys? only|male only)',
-            r'(mix gender|mixed gender|mixed-gender)'
-        ]
-        for pattern in gender_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in RULE_GENDER_PATTERNS:
+            match = pattern.search(message)
             if match:
                 extracted["gender_preference"] = match.group(1).strip()
                 break
         
-        # Enhanced additional notes
+        # Enhanced additional notes - only the first three are kept, so later patterns are skipped once there are enough
         notes = []
-        note_patterns = [
-            r'(utilities included|utilities[\s\w]*included)',
-            r'(furnished|fully furnished)',
-            r'(vegetarian|veg only|no food preference)',
-            r'(no broker fee|no brokerage)',
-            r'(parking available|parking included)',
-            r'(laundry[\s\w]*building|in-house laundry|in-unit laundry)'
-        ]
-        for pattern in note_patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            notes.extend(matches)
+        for pattern in RULE_NOTE_PATTERNS:
+            notes.extend(pattern.findall(message))
+            if len(notes) >= RULE_MAX_NOTES:
+                break
         
         if notes:
-            extracted["additional_notes"] = ", ".join(notes[:3])  # Limit to 3 notes
+            extracted["additional_notes"] = ", ".join(notes[:RULE_MAX_NOTES])
         
         return extracted
     
@@ -838,57 +1565,62 @@ class RoomScoutPipeline:
         """
         FIXED: Complete pipeline processing with proper extraction integration
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Step 1: Parse message (FIXED)
             parsed = self.parse_whatsapp_message(message)
-            logger.info(f"📝 Parsed message: {parsed['parsed'][:100]}...")
+            logger.info("📝 Parsed message: %.100s...", parsed["parsed"])
             
-            # Step 2: Classify (working)
+            # Step 2: Classify (working) - with SPECULATIVE_EXTRACTION on, extraction starts alongside
+            # an LLM classification so a housing message waits for one round-trip instead of two
+            extraction_future = None
+            if SPECULATIVE_EXTRACTION and self._needs_llm_classification(parsed["parsed"]):
+                extraction_future = llm_executor.submit(self.extract_housing_data, parsed["parsed"])
             classification = self.classify_message(parsed["parsed"])
-            logger.info(f"🤖 Classification: {classification['is_housing']} - {classification.get('reasoning', '')[:50]}...")
+            logger.info("🤖 Classification: %s - %.50s...", classification["is_housing"], classification.get("reasoning", ""))
             
             # Step 3: Extract if housing-related (FIXED)
             extracted_data = {}
             extraction_result = {"confidence_score": 0.0}
             saved_to_db = False
             
+            if extraction_future and not classification["is_housing"]:
+                # Not housing - drop the speculative extraction if it hasn't started yet
+                extraction_future.cancel()
+            
             if classification["is_housing"]:
                 logger.info("🔍 Message classified as housing - attempting extraction")
-                extraction_result = self.extract_housing_data(parsed["parsed"])
+                if extraction_future:
+                    extraction_result = extraction_future.result()
+                else:
+                    extraction_result = self.extract_housing_data(parsed["parsed"])
                 extracted_data = extraction_result["extracted_data"]
                 
                 # FIXED: Validate extraction actually worked
-                logger.info(f"🔍 Checking extraction condition...")
-                logger.info(f"🔍 extracted_data exists: {bool(extracted_data)}")
-                logger.info(f"🔍 extracted_data type: {type(extracted_data)}")
-                logger.info(f"🔍 extracted_data content: {extracted_data}")
-                
                 # Check if extraction was successful by looking at the extraction method
                 extraction_method = extraction_result.get('extraction_method', 'none')
                 is_successful_extraction = extraction_method in ['ai_extraction', 'rule_based_fallback']
                 
-                logger.info(f"🔍 Extraction method: {extraction_method}")
-                logger.info(f"🔍 Is successful extraction: {is_successful_extraction}")
+                # Per-message diagnostics are debug-level with lazy formatting, so batch runs
+                # don't pay for formatting the extracted dict several times per message
+                logger.debug("🔍 Extraction method: %s, successful: %s, extracted data: %s",
+                             extraction_method, is_successful_extraction, extracted_data)
                 
                 if is_successful_extraction and extracted_data:
-                    logger.info(f"✅ Extraction successful: {extraction_result['extraction_method']}")
-                    logger.info(f"🔍 Extracted data: {extracted_data}")
-                    logger.info(f"🔍 Has rent_price: {bool(extracted_data.get('rent_price'))}")
-                    logger.info(f"🔍 Has location: {bool(extracted_data.get('location'))}")
+                    logger.info("✅ Extraction successful: %s", extraction_result["extraction_method"])
                     
                     # Save to database if extraction was successful
                     try:
-                        logger.info("💾 Attempting to save extracted listing to database...")
+                        logger.debug("💾 Attempting to save extracted listing to database...")
                         save_result = self.save_extracted_listing_to_db(
                             extracted_data, 
                             parsed["parsed"],
                             user_id=None  # Can be enhanced to pass user_id
                         )
-                        logger.info(f"💾 Save result: {save_result}")
+                        logger.debug("💾 Save result: %s", save_result)
                         if save_result["success"]:
-                            logger.info(f"💾 Successfully saved listing to database: {save_result.get('listing_id')}")
+                            logger.info("💾 Successfully saved listing to database: %s", save_result.get("listing_id"))
                             saved_to_db = True
                         else:
                             logger.warning(f"⚠️ Failed to save listing: {save_result.get('error')}")
@@ -904,7 +1636,7 @@ class RoomScoutPipeline:
             else:
                 logger.info("ℹ️ Message not housing-related - skipping extraction")
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             
             return {
                 "input_text": parsed["parsed"],
@@ -929,20 +1661,29 @@ class RoomScoutPipeline:
                 "is_housing": False,
                 "classification_reasoning": f"Error: {str(e)}",
                 "extracted_data": {},
-                "processing_time": time.time() - start_time,
+                "processing_time": time.perf_counter() - start_time,
                 "errors": [str(e)],
                 "confidence_score": 0.0,
                 "security_status": "ERROR",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": iso_now(),
                 "development_mode": False,
                 "model_used": MODEL_NAME if self.llm else "simulated",
                 "extraction_method": "error"
             }
 
+    def process_messages(self, messages: List[str]) -> List[Dict[str, Any]]:
+        """Run process_message over a batch concurrently - results stay in input order"""
+        if len(messages) <= 1:
+            return [self.process_message(message) for message in messages]
+        return list(batch_executor.map(self.process_message, messages))
+
     def generate_ai_chat_response(self, message: str, context: str = "") -> Dict[str, Any]:
         """Generate AI-powered conversational responses using LangChain"""
+        context = bound_chat_context(context)
+        # Lowercased once for every keyword-based branch below
+        message_lower = message.lower()
         try:
-            logger.info(f"💬 Processing chat query: {message[:50]}...")
+            logger.info("💬 Processing chat query: %.50s...", message)
             
             # Step 1: First, classify if this is housing-related using the comprehensive classification
             try:
@@ -950,12 +1691,12 @@ class RoomScoutPipeline:
                 is_housing_related = classification_result.get("is_housing", False)
                 classification_method = classification_result.get("classification_method", "unknown")
                 
-                logger.info(f"🤖 Classification result: {is_housing_related} (method: {classification_method})")
+                logger.info("🤖 Classification result: %s (method: %s)", is_housing_related, classification_method)
                 
                 # Step 2: If NOT housing-related, redirect to housing topics
                 if not is_housing_related:
                     logger.info("🔄 Non-housing query detected, redirecting to housing topics")
-                    redirect_response = self._generate_housing_redirect_response(message)
+                    redirect_response = self._generate_housing_redirect_response(message_lower)
                     
                     return {
                         "response": redirect_response,
@@ -974,17 +1715,17 @@ class RoomScoutPipeline:
                 parsed_criteria = self._parse_search_query_ai(message)
                 query_type = parsed_criteria.get('query_type', 'CONVERSATION')
                 
-                logger.info(f"🤖 AI classified query as: {query_type}")
+                logger.info("🤖 AI classified query as: %s", query_type)
                 
                 # Handle different query types appropriately
                 if query_type == 'HOUSING_SEARCH':
                     logger.info("🔍 AI detected housing search, searching database")
                     search_criteria = parsed_criteria['search_criteria']
-                    logger.info(f"🔎 Searching database with criteria: {search_criteria}")
+                    logger.info("🔎 Searching database with criteria: %s", search_criteria)
                     
                     search_result = self._search_housing_with_criteria(search_criteria)
                     listings = search_result.get('listings', [])
-                    logger.info(f"📊 Found {len(listings)} listings on page {search_result.get('page', 1)} of {search_result.get('totalPages', 1)}")
+                    logger.info("📊 Found %d listings on page %s of %s", len(listings), search_result.get("page", 1), search_result.get("totalPages", 1))
                     
                     # Generate AI response about the search results
                     response_text = self._generate_search_response_ai(message, search_criteria, search_result)
@@ -1015,10 +1756,10 @@ class RoomScoutPipeline:
                             "context": context
                         })
                         
-                        suggestions = self._generate_contextual_suggestions(message, chat_response.content)
+                        suggestions = self._generate_contextual_suggestions(message_lower, chat_response)
                         
                         return {
-                            "response": chat_response.content,
+                            "response": chat_response,
                             "type": "housing_advice", 
                             "suggestions": suggestions,
                             "ai_generated": True
@@ -1033,10 +1774,10 @@ class RoomScoutPipeline:
                             "context": context
                         })
                         
-                        suggestions = self._generate_contextual_suggestions(message, chat_response.content)
+                        suggestions = self._generate_contextual_suggestions(message_lower, chat_response)
                         
                         return {
-                            "response": chat_response.content,
+                            "response": chat_response,
                             "type": "conversational_ai", 
                             "suggestions": suggestions,
                             "ai_generated": True
@@ -1048,13 +1789,11 @@ class RoomScoutPipeline:
             # Step 4: Smart fallback - try to search database even if AI failed
             try:
                 # Extract basic search criteria from the message
-                import re
-                budget_match = re.search(r'\$?(\d+)', message)
+                budget_match = BUDGET_RE.search(message)
                 budget_amount = int(budget_match.group(1)) if budget_match else None
                 
                 # Check if message contains housing-related keywords
-                housing_keywords = ['rent', 'apartment', 'room', 'housing', 'place', 'home', 'dollar', 'price', 'cost']
-                is_housing_query = any(keyword in message.lower() for keyword in housing_keywords)
+                is_housing_query = FALLBACK_HOUSING_KEYWORD_RE.search(message) is not None
                 
                 if is_housing_query or budget_amount:
                     logger.info("🔍 Smart fallback: Searching database for housing query")
@@ -1067,26 +1806,11 @@ class RoomScoutPipeline:
                             "target": budget_amount if budget_amount else None,
                             "range_type": "around" if budget_amount else None
                         },
-                        "location": {
-                            "neighborhoods": [],
-                            "proximity": None,
-                            "city": "Boston"
-                        },
-                        "room_type": {
-                            "property_types": [],
-                            "bedroom_count": None,
-                            "room_types": []
-                        },
-                        "timeline": {
-                            "availability": None,
-                            "start_date": None
-                        },
-                        "amenities": [],
-                        "intent": "search"
+                        **FALLBACK_SEARCH_CRITERIA
                     }
                     
                     listings = self._search_housing_with_criteria(search_criteria)
-                    logger.info(f"📊 Found {len(listings)} listings in fallback search")
+                    logger.info("📊 Found %d listings in fallback search", len(listings))
                     
                     if listings and len(listings) > 0:
                         # Generate response about the fallback search results
@@ -1134,10 +1858,10 @@ class RoomScoutPipeline:
                         "context": context
                     })
                     
-                    suggestions = self._generate_contextual_suggestions(message, chat_response.content)
+                    suggestions = self._generate_contextual_suggestions(message_lower, chat_response)
                     
                     return {
-                        "response": chat_response.content,
+                        "response": chat_response,
                         "type": "ai_conversation", 
                         "suggestions": suggestions,
                         "ai_generated": True
@@ -1148,7 +1872,7 @@ class RoomScoutPipeline:
             # Step 5.5: Simulated AI response for testing (when no OpenAI key)
             elif self.development_mode:
                 logger.info("🤖 Using simulated AI response for testing")
-                simulated_ai_response = self._generate_simulated_ai_response(message, context)
+                simulated_ai_response = self._generate_simulated_ai_response(message_lower)
                 return {
                     "response": simulated_ai_response,
                     "type": "simulated_ai_conversation",
@@ -1159,7 +1883,7 @@ class RoomScoutPipeline:
             
             # Step 6: Smart dev response as final fallback
             logger.info("🔧 Using smart dev response as final fallback")
-            smart_response = self._generate_smart_dev_response(message, context)
+            smart_response = self._generate_smart_dev_response(message, message_lower)
             return smart_response
                 
         except Exception as e:
@@ -1173,10 +1897,10 @@ class RoomScoutPipeline:
                         "context": context
                     })
                     
-                    suggestions = self._generate_contextual_suggestions(message, chat_response.content)
+                    suggestions = self._generate_contextual_suggestions(message_lower, chat_response)
                     
                     return {
-                        "response": chat_response.content,
+                        "response": chat_response,
                         "type": "ai_conversation_error_recovery", 
                         "suggestions": suggestions,
                         "ai_generated": True
@@ -1186,7 +1910,7 @@ class RoomScoutPipeline:
             
             # Use smart dev response as final error recovery
             try:
-                smart_response = self._generate_smart_dev_response(message, context)
+                smart_response = self._generate_smart_dev_response(message, message_lower)
                 smart_response["type"] = "error_recovery"
                 return smart_response
             except Exception as fallback_error:
@@ -1219,263 +1943,250 @@ class RoomScoutPipeline:
         suggestions.append("Check if this is legitimate")
         return suggestions[:3]
     
-    def _generate_contextual_suggestions(self, user_message: str, ai_response: str) -> List[str]:
+    def _generate_contextual_suggestions(self, message_lower: str, ai_response: str) -> List[str]:
         """Generate suggestions based on conversation context"""
-        message_lower = user_message.lower()
-        response_lower = ai_response.lower()
-        
         suggestions = []
+        neighborhood = next((hood for hood in BOSTON_NEIGHBORHOODS if hood in message_lower), None)
         
         # Budget-related suggestions
-        if any(word in message_lower for word in ['budget', 'cheap', 'affordable', 'under']):
+        if any(word in message_lower for word in BUDGET_WORDS):
             suggestions.extend(["Show me specific listings", "Find roommate options", "Get money-saving tips"])
         
         # Neighborhood suggestions
-        elif any(hood in message_lower for hood in ['mission hill', 'back bay', 'fenway', 'roxbury', 'jamaica plain', 'cambridge', 'somerville', 'allston', 'brighton', 'brookline', 'davis square', 'porter square', 'harvard square', 'central square', 'inman square', 'union square', 'assembly square', 'medford', 'malden', 'revere', 'quincy', 'dorchester', 'south end', 'north end', 'charlestown', 'east boston', 'seaport', 'financial district', 'beacon hill', 'south boston', 'west roxbury', 'roslindale', 'hyde park', 'mattapan']):
-            neighborhood = next((hood for hood in ['mission hill', 'back bay', 'fenway', 'roxbury', 'jamaica plain', 'cambridge', 'somerville', 'allston', 'brighton', 'brookline', 'davis square', 'porter square', 'harvard square', 'central square', 'inman square', 'union square', 'assembly square', 'medford', 'malden', 'revere', 'quincy', 'dorchester', 'south end', 'north end', 'charlestown', 'east boston', 'seaport', 'financial district', 'beacon hill', 'south boston', 'west roxbury', 'roslindale', 'hyde park', 'mattapan'] if hood in message_lower), '')
-            if neighborhood:
-                suggestions.extend([f"Find {neighborhood.title()} listings", "Compare with other areas", "Get safety info"])
+        elif neighborhood:
+            suggestions.extend([f"Find {neighborhood.title()} listings", "Compare with other areas", "Get safety info"])
         
         # General housing suggestions
-        elif any(word in message_lower for word in ['housing', 'apartment', 'room']):
+        elif any(word in message_lower for word in HOUSING_WORDS):
             suggestions.extend(["Tell me your budget", "Which neighborhood interests you?", "Need roommate help?"])
         
-        # Default suggestions based on response content
-        if 'mission hill' in response_lower:
-            suggestions.append("Search Mission Hill listings")
-        if 'budget' in response_lower:
-            suggestions.append("Find budget options")
-        if 'roommate' in response_lower:
-            suggestions.append("Get roommate matching help")
-            
+        # Default suggestions based on response content - only needed (and the long
+        # response only lowercased) when the message didn't already fill all three
+        if len(suggestions) < 3:
+            response_lower = ai_response.lower()
+            suggestions.extend(
+                suggestion for phrase, suggestion in RESPONSE_SUGGESTIONS if phrase in response_lower
+            )
+        
         # Always include file upload option
         if len(suggestions) < 3:
             suggestions.append("Upload WhatsApp file")
         
         return suggestions[:3]
     
-    def _generate_smart_dev_response(self, message: str, context: str) -> Dict[str, Any]:
+    def _generate_smart_dev_response(self, message: str, message_lower: str) -> Dict[str, Any]:
         """Smart development responses that feel AI-generated"""
-        message_lower = message.lower()
+        intent = classify_dev_intent(message_lower)
         
-        # Check if this is a housing search query using AI
-        search_query_indicators = [
-            'show me', 'find', 'search', 'looking for', 'need', 'want',
-            'housing', 'apartment', 'room', 'place', 'listing'
-        ]
+        # Housing search queries fall through to the keyword branches when the AI parse isn't a search
+        if intent is DevIntent.SEARCH:
+            search_response = self._dev_search_response(message)
+            if search_response:
+                return search_response
+            intent = classify_dev_intent(message_lower, allow_search=False)
         
-        if any(indicator in message.lower() for indicator in search_query_indicators):
-            # Use AI to parse search criteria
-            parsed_criteria = self._parse_search_query_ai(message)
+        return self._DEV_RESPONSE_HANDLERS[intent](self, message, message_lower)
+    
+    def _dev_search_response(self, message: str) -> Optional[Dict[str, Any]]:
+        """Search the database for AI-parsed criteria; None when the query isn't a housing search"""
+        # Use AI to parse search criteria
+        parsed_criteria = self._parse_search_query_ai(message)
+        
+        if parsed_criteria.get('query_type') == 'HOUSING_SEARCH':
+            # Search for housing based on AI-extracted criteria
+            search_criteria = parsed_criteria['search_criteria']
+            search_result = self._search_housing_with_criteria(search_criteria)
+            listings = search_result.get('listings', [])
             
-            if parsed_criteria.get('query_type') == 'HOUSING_SEARCH':
-                # Search for housing based on AI-extracted criteria
-                search_criteria = parsed_criteria['search_criteria']
-                search_result = self._search_housing_with_criteria(search_criteria)
-                listings = search_result.get('listings', [])
-                
-                # Generate AI response about the search results
-                response_text = self._generate_search_response_ai(message, search_criteria, search_result)
-                
-                return {
-                    "response": response_text,
-                    "type": "housing_search_results",
-                    "data": {
-                        "listings": listings, 
-                        "count": len(listings),
-                        "total": search_result.get('total', 0),
-                        "page": search_result.get('page', 1),
-                        "totalPages": search_result.get('totalPages', 1),
-                        "hasNextPage": search_result.get('hasNextPage', False),
-                        "hasPrevPage": search_result.get('hasPrevPage', False),
-                        "search_criteria": search_criteria
-                    },
-                    "suggestions": self._generate_search_suggestions(search_criteria, search_result),
-                    "ai_generated": False,
-                    "dev_mode": True
-                }
-        
-        # Extract budget if mentioned
-        import re
-        budget_match = re.search(r'\$?(\d+)', message)
-        budget_amount = int(budget_match.group(1)) if budget_match else None
-        
-        # Budget queries with realistic advice
-        if any(word in message_lower for word in ['budget', 'cheap', 'under', 'below', 'affordable']):
-            if budget_amount and budget_amount < 500:
-                response = f"💰 I hear you on wanting housing under ${budget_amount}! Boston is expensive, but let's get creative! 💪\n\n"
-                response += "🎯 **Your best strategy**: Find 2-3 roommates to split a bigger place:\n"
-                response += "• 3BR house in Roxbury ÷ 3 people = ~$450 each\n"
-                response += "• Mission Hill group houses = $500-600 each\n"
-                response += "• Look for 'utilities included' to save more\n\n"
-                response += "I can help you find roommate groups! That's honestly your best path to affordable housing. Want some specific tips?"
-                
-                suggestions = ["Find roommate groups", "Search group houses", "Get cost-splitting advice"]
-                
-            elif budget_amount and budget_amount <= 800:
-                response = f"💰 ${budget_amount}/month is totally workable for NEU students! Here's the realistic game plan:\n\n"
-                response += "🏠 **Your sweet spot options**:\n"
-                response += "• Mission Hill shared rooms ($600-750) - closest to campus!\n"
-                response += "• Roxbury private rooms ($650-800) - up and coming area\n"
-                response += "• JP shared spaces ($700-800) - artsy and fun\n\n"
-                response += "Mission Hill is probably your best bet - super convenient for getting to class. Want me to break down what to look for?"
-                
-                suggestions = ["Find Mission Hill options", "Learn about Roxbury", "Get room-hunting tips"]
-                
-            else:
-                response = f"💰 Nice! With ${budget_amount or 'your budget'}, you've got solid options in Boston! 🎉\n\n"
-                response += "🏠 **Here's what's realistic**:\n"
-                response += "• Mission Hill private rooms ($800-1000)\n"
-                response += "• Fenway shared apartments ($900-1100)\n"
-                response += "• Maybe even Back Bay studios if you're lucky! ($1200+)\n\n"
-                response += "The key question: Do you want to be super close to campus (Mission Hill) or okay with a short T ride for more neighborhood options?"
-                
-                suggestions = ["Prioritize campus closeness", "Explore neighborhood options", "Find current listings"]
+            # Generate AI response about the search results
+            response_text = self._generate_search_response_ai(message, search_criteria, search_result)
             
             return {
-                "response": response,
-                "type": "budget_consultation",
-                "suggestions": suggestions,
+                "response": response_text,
+                "type": "housing_search_results",
+                "data": {
+                    "listings": listings, 
+                    "count": len(listings),
+                    "total": search_result.get('total', 0),
+                    "page": search_result.get('page', 1),
+                    "totalPages": search_result.get('totalPages', 1),
+                    "hasNextPage": search_result.get('hasNextPage', False),
+                    "hasPrevPage": search_result.get('hasPrevPage', False),
+                    "search_criteria": search_criteria
+                },
+                "suggestions": self._generate_search_suggestions(search_criteria, search_result),
                 "ai_generated": False,
                 "dev_mode": True
             }
         
-        # Neighborhood queries
-        elif any(hood in message_lower for hood in ['mission hill', 'back bay', 'fenway', 'roxbury', 'jamaica plain', 'cambridge', 'somerville', 'allston', 'brighton', 'brookline', 'davis square', 'porter square', 'harvard square', 'central square', 'inman square', 'union square', 'assembly square', 'medford', 'malden', 'revere', 'quincy', 'dorchester', 'south end', 'north end', 'charlestown', 'east boston', 'seaport', 'financial district', 'beacon hill', 'south boston', 'west roxbury', 'roslindale', 'hyde park', 'mattapan']):
-            if 'mission hill' in message_lower:
-                response = "🏃‍♂️ **Mission Hill - The NEU Student Capital!**\n\n"
-                response += "This is where like 60% of NEU students end up! And for good reason:\n\n"
-                response += "📍 **8-minute walk to campus** - you can literally roll out of bed to class\n"
-                response += "💰 **$550-1000** depending on your setup\n"
-                response += "🍕 **Parker Street** is food heaven (and cheap!)\n"
-                response += "🚇 **Orange Line** when you want to explore downtown\n\n"
-                response += "**Real talk**: It gets loud on weekends and parking sucks, but you're in the heart of student life! \n\nWhat matters most to you - being super close to campus or having a quieter spot?"
-                
-                suggestions = ["Find Mission Hill listings", "Compare noise levels", "Get parking info"]
-                
-            elif 'back bay' in message_lower:
-                response = "🏛️ **Back Bay - Living the Boston Dream!**\n\n"
-                response += "Gorgeous Victorian brownstones, tree-lined streets - this is postcard Boston! 📸\n\n"
-                response += "💰 **$1200-2500** (yeah, it's pricey but here's why...)\n"
-                response += "🍽️ **Incredible restaurants** on every corner\n"
-                response += "🚇 **Multiple T lines** - you can get anywhere\n"
-                response += "🏛️ **Safe, beautiful, prestigious**\n\n"
-                response += "**The trade-off**: You're paying for location and prestige. Worth it if you can swing it! \n\nWhat's your budget looking like? I might know some Back Bay tricks..."
-                
-                suggestions = ["Find Back Bay deals", "Compare costs with other areas", "Get budget strategies"]
+        return None
+    
+    def _dev_budget_response(self, message: str, message_lower: str) -> Dict[str, Any]:
+        """Budget queries with realistic advice"""
+        # Extract budget if mentioned
+        budget_match = BUDGET_RE.search(message)
+        budget_amount = int(budget_match.group(1)) if budget_match else None
+        
+        if budget_amount and budget_amount < 500:
+            response = (
+                f"💰 I hear you on wanting housing under ${budget_amount}! Boston is expensive, but let's get creative! 💪\n\n"
+                "🎯 **Your best strategy**: Find 2-3 roommates to split a bigger place:\n"
+                "• 3BR house in Roxbury ÷ 3 people = ~$450 each\n"
+                "• Mission Hill group houses = $500-600 each\n"
+                "• Look for 'utilities included' to save more\n\n"
+                "I can help you find roommate groups! That's honestly your best path to affordable housing. Want some specific tips?"
+            )
             
-            elif 'roxbury' in message_lower:
-                response = "🏘️ **Roxbury - Up and Coming!**\n\n"
-                response += "Roxbury is getting more popular with students for good reasons:\n\n"
-                response += "💰 **$600-900** - much more affordable than other areas!\n"
-                response += "🚇 **Orange Line** access to downtown and NEU\n"
-                response += "🏪 **Dudley Square** has great shopping and food\n"
-                response += "🌳 **Franklin Park** for outdoor activities\n\n"
-                response += "**Student vibe**: It's becoming more student-friendly with new developments. Want me to show you some specific Roxbury options?"
-                
-                suggestions = ["Find Roxbury listings", "Learn about Dudley Square", "Get safety info"]
+            suggestions = ["Find roommate groups", "Search group houses", "Get cost-splitting advice"]
             
-            else:
-                # Generic neighborhood response for other areas
-                response = f"🏠 I see you're interested in Boston neighborhoods! I know all the areas well.\n\n"
-                response += "**Quick neighborhood guide**:\n"
-                response += "• **Mission Hill**: Closest to NEU, student central\n"
-                response += "• **Back Bay**: Upscale, expensive but beautiful\n"
-                response += "• **Roxbury**: Affordable, up and coming\n"
-                response += "• **Jamaica Plain**: Artsy, laid-back vibe\n"
-                response += "• **Allston/Brighton**: College town feel\n\n"
-                response += "What's most important to you - being close to campus, budget, or neighborhood vibe?"
-                
-                suggestions = ["Find listings in this area", "Compare neighborhoods", "Get budget advice"]
+        elif budget_amount and budget_amount <= 800:
+            response = (
+                f"💰 ${budget_amount}/month is totally workable for NEU students! Here's the realistic game plan:\n\n"
+                "🏠 **Your sweet spot options**:\n"
+                "• Mission Hill shared rooms ($600-750) - closest to campus!\n"
+                "• Roxbury private rooms ($650-800) - up and coming area\n"
+                "• JP shared spaces ($700-800) - artsy and fun\n\n"
+                "Mission Hill is probably your best bet - super convenient for getting to class. Want me to break down what to look for?"
+            )
+            
+            suggestions = ["Find Mission Hill options", "Learn about Roxbury", "Get room-hunting tips"]
             
-            return {
-                "response": response,
-                "type": "neighborhood_expertise",
-                "suggestions": suggestions,
-                "ai_generated": False,
-                "dev_mode": True
-            }
-        
-        # Default - encouraging and conversational
         else:
-            response = f"Hey! 👋 I caught your message: \"{message[:40]}{'...' if len(message) > 40 else ''}\"\n\n"
-            response += "I'm RoomScout AI - basically your personal Boston housing expert! 🏠 I've helped tons of NEU students find great places.\n\n"
-            response += "**I'm really good at**:\n"
-            response += "• Finding apartments that actually fit student budgets 💰\n"
-            response += "• Giving you the real scoop on neighborhoods 📍\n"
-            response += "• Analyzing those chaotic WhatsApp housing groups 📱\n"
-            response += "• Helping you find cool roommates 👥\n\n"
-            response += "What's your housing situation? First time looking in Boston, or need something new?"
+            response = (
+                f"💰 Nice! With ${budget_amount or 'your budget'}, you've got solid options in Boston! 🎉\n\n"
+                "🏠 **Here's what's realistic**:\n"
+                "• Mission Hill private rooms ($800-1000)\n"
+                "• Fenway shared apartments ($900-1100)\n"
+                "• Maybe even Back Bay studios if you're lucky! ($1200+)\n\n"
+                "The key question: Do you want to be super close to campus (Mission Hill) or okay with a short T ride for more neighborhood options?"
+            )
             
-            return {
-                "response": response,
-                "type": "friendly_engagement",
-                "suggestions": ["First time in Boston", "Need something new", "Just browsing options"],
-                "ai_generated": False,
-                "dev_mode": True
-            }
+            suggestions = ["Prioritize campus closeness", "Explore neighborhood options", "Find current listings"]
+        
+        return {
+            "response": response,
+            "type": "budget_consultation",
+            "suggestions": suggestions,
+            "ai_generated": False,
+            "dev_mode": True
+        }
+    
+    def _dev_neighborhood_response(self, message: str, message_lower: str) -> Dict[str, Any]:
+        """Neighborhood queries"""
+        response, suggestions = next(
+            ((response, suggestions) for keyword, response, suggestions in DEV_NEIGHBORHOOD_RESPONSES
+             if keyword in message_lower),
+            (DEV_NEIGHBORHOOD_DEFAULT_RESPONSE, DEV_NEIGHBORHOOD_DEFAULT_SUGGESTIONS)
+        )
+        
+        return {
+            "response": response,
+            "type": "neighborhood_expertise",
+            "suggestions": list(suggestions),
+            "ai_generated": False,
+            "dev_mode": True
+        }
+    
+    def _dev_default_response(self, message: str, message_lower: str) -> Dict[str, Any]:
+        """Default - encouraging and conversational"""
+        response = (
+            f"Hey! 👋 I caught your message: \"{message[:40]}{'...' if len(message) > 40 else ''}\"\n\n"
+            "I'm RoomScout AI - basically your personal Boston housing expert! 🏠 I've helped tons of NEU students find great places.\n\n"
+            "**I'm really good at**:\n"
+            "• Finding apartments that actually fit student budgets 💰\n"
+            "• Giving you the real scoop on neighborhoods 📍\n"
+            "• Analyzing those chaotic WhatsApp housing groups 📱\n"
+            "• Helping you find cool roommates 👥\n\n"
+            "What's your housing situation? First time looking in Boston, or need something new?"
+        )
+        
+        return {
+            "response": response,
+            "type": "friendly_engagement",
+            "suggestions": ["First time in Boston", "Need something new", "Just browsing options"],
+            "ai_generated": False,
+            "dev_mode": True
+        }
+    
+    _DEV_RESPONSE_HANDLERS = {
+        DevIntent.BUDGET: _dev_budget_response,
+        DevIntent.NEIGHBORHOOD: _dev_neighborhood_response,
+        DevIntent.DEFAULT: _dev_default_response,
+    }
 
-    def _generate_simulated_ai_response(self, message: str, context: str) -> str:
+    def _generate_simulated_ai_response(self, message_lower: str) -> str:
         """Generate simulated AI responses that feel like real GPT responses"""
-        message_lower = message.lower()
-        
         # Simulate AI understanding and responses
-        if any(word in message_lower for word in ['mission hill', 'mission']):
+        if 'mission' in message_lower:
             return "🏃‍♂️ **Mission Hill** is absolutely the go-to neighborhood for NEU students! Here's what makes it special:\n\n**Location & Convenience**:\n• 8-minute walk to Northeastern campus\n• Orange Line T access for downtown trips\n• Parker Street food scene is legendary\n\n**Student Life**:\n• 60% of NEU students live here\n• Vibrant social scene with lots of student housing\n• Great for meeting other students\n\n**Cost Range**: $550-1000 depending on setup\n\n**Trade-offs**:\n• Can be noisy on weekends\n• Limited parking options\n• But you're in the heart of student life!\n\nWould you like me to help you find specific Mission Hill listings or compare it with other neighborhoods?"
         
-        elif any(word in message_lower for word in ['roxbury', 'rox']):
+        elif 'rox' in message_lower:
             return "🏘️ **Roxbury** is becoming increasingly popular with students for several compelling reasons:\n\n**Affordability**:\n• Significantly cheaper than other areas ($600-900)\n• Great value for the location\n\n**Accessibility**:\n• Orange Line T access to downtown and NEU\n• Multiple bus routes\n• Easy commute to campus\n\n**Neighborhood Perks**:\n• Dudley Square shopping and dining\n• Franklin Park for outdoor activities\n• Growing student-friendly developments\n\n**Student Appeal**:\n• More diverse and authentic Boston experience\n• Up-and-coming area with new developments\n• Great for students who want value and character\n\nWould you like me to search for current Roxbury listings or tell you more about specific areas within Roxbury?"
         
-        elif any(word in message_lower for word in ['budget', 'cheap', 'affordable', 'under']):
+        elif any(word in message_lower for word in BUDGET_WORDS):
             return "💰 **Budget-friendly housing in Boston** - I understand the challenge! Here's my AI-powered analysis:\n\n**Best Budget Strategies**:\n• **Roommate situations**: Split 2-3BR apartments ($450-600 each)\n• **Mission Hill group houses**: $500-600 per person\n• **Roxbury shared spaces**: $600-800 per person\n• **JP student housing**: $700-900 per person\n\n**Money-Saving Tips**:\n• Look for 'utilities included' to avoid extra costs\n• Consider longer leases for better rates\n• Check for student discounts\n• Negotiate when possible\n\n**My Recommendation**: Start with Mission Hill roommate situations - you get proximity to campus AND affordability.\n\nWhat's your target budget? I can give you specific recommendations!"
         
-        elif any(word in message_lower for word in ['search', 'find', 'looking', 'need', 'want']):
+        elif any(word in message_lower for word in SIMULATED_SEARCH_WORDS):
             return "🔍 **AI-Powered Housing Search** - I'm here to help you find the perfect place!\n\n**I can help you with**:\n• Finding apartments in specific neighborhoods\n• Budget-friendly options near NEU\n• Roommate matching and group housing\n• Neighborhood comparisons and insights\n• Amenity-based searches (laundry, parking, etc.)\n\n**To get started, tell me**:\n• Your budget range\n• Preferred neighborhoods\n• Must-have amenities\n• Timeline for moving\n\nI'll search our database and give you personalized recommendations based on your criteria. What are you looking for?"
         
         else:
             return "🤖 **AI Assistant Response**: Hi! I'm RoomScout AI, your intelligent Boston housing assistant. I use advanced language processing to understand your housing needs and provide personalized recommendations.\n\n**How I can help**:\n• **Smart Search**: I analyze your requirements and find matching listings\n• **Neighborhood Insights**: AI-powered analysis of Boston areas\n• **Budget Optimization**: Machine learning to find the best value\n• **Personalized Advice**: Context-aware recommendations\n\n**My AI capabilities**:\n• Natural language understanding of your housing needs\n• Real-time database searching and filtering\n• Predictive analysis of neighborhood trends\n• Intelligent matching of preferences to available listings\n\nWhat would you like to know about Boston housing? I'm here to help with any questions!"
     
-    def _generate_housing_redirect_response(self, message: str) -> str:
+    def _generate_housing_redirect_response(self, message_lower: str) -> str:
         """Generates a response that redirects a non-housing query to housing topics."""
-        message_lower = message.lower()
-        
-        # Specific cases for common non-housing queries
-        if 'jackfruit' in message_lower or 'fruit' in message_lower:
-            return "🍈 I'm RoomScout AI, focused on Boston housing! While I can't tell you about jackfruit, I can help you find the perfect apartment near NEU. What's your budget for rent? I know great places across all of Boston's neighborhoods! 🏠"
-        elif 'pizza' in message_lower:
-            return "🍕 I'm RoomScout AI, your Boston housing expert! While I can't recommend pizza places, I can help you find apartments near great restaurants. What neighborhood are you interested in? Boston has amazing food options everywhere! 🏠"
-        elif 'weather' in message_lower:
-            return "🌤️ I'm RoomScout AI, focused on housing! While I can't give weather updates, I can help you find apartments with great heating/cooling systems. What's your budget? I know places that stay comfortable year-round! 🏠"
-        elif 'history' in message_lower:
-            return "🏛️ I'm RoomScout AI, your housing specialist! While I can't give history lessons, I can help you find apartments in Boston's historic neighborhoods like Beacon Hill or the North End. What's your budget? 🏠"
-        elif 'laptop' in message_lower or 'computer' in message_lower:
-            return "💻 I'm RoomScout AI, focused on housing! While I can't recommend laptops, I can help you find apartments with great internet and study spaces. Many NEU students need quiet places to work - what's your budget? 🏠"
-        elif 'job' in message_lower or 'career' in message_lower:
-            return "👔 I'm RoomScout AI, your housing expert! While I can't give career advice, I can help you find apartments near job centers in Boston. What's your budget? I know great places near the Financial District and Seaport! 🏠"
-        elif 'sports' in message_lower:
-            return "🏈 I'm RoomScout AI, focused on housing! While I can't give sports updates, I can help you find apartments near Fenway Park or TD Garden. What's your budget? I know great places for sports fans! 🏠"
-        elif 'shopping' in message_lower:
-            return "🛍️ I'm RoomScout AI, your housing specialist! While I can't recommend stores, I can help you find apartments near shopping districts like Newbury Street or Assembly Row. What's your budget? 🏠"
-        elif 'restaurant' in message_lower:
-            return "🍽️ I'm RoomScout AI, focused on housing! While I can't recommend restaurants, I can help you find apartments in foodie neighborhoods like the North End or South End. What's your budget? 🏠"
-        elif 'grocery' in message_lower:
-            return "🛒 I'm RoomScout AI, your housing expert! While I can't recommend grocery stores, I can help you find apartments near supermarkets and farmers markets. What's your budget? I know places near great food options! 🏠"
-        elif 'transportation' in message_lower:
-            return "🚇 I'm RoomScout AI, focused on housing! While I can't give transit advice, I can help you find apartments near T stations and bus routes. What's your preferred commute time to NEU? 🏠"
-        elif 'fitness' in message_lower or 'gym' in message_lower:
-            return "🏋️‍♂️ I'm RoomScout AI, your housing specialist! While I can't recommend gyms, I can help you find apartments with fitness centers or near gyms. What's your budget? Many buildings have great amenities! 🏠"
-        elif 'travel' in message_lower:
-            return "✈️ I'm RoomScout AI, focused on housing! While I can't plan trips, I can help you find apartments near Logan Airport or major transportation hubs. What's your budget? 🏠"
-        elif 'dating' in message_lower or 'relationship' in message_lower:
-            return "💑 I'm RoomScout AI, your housing expert! While I can't give dating advice, I can help you find apartments in social neighborhoods with great nightlife. What's your budget? 🏠"
-        elif 'music' in message_lower or 'art' in message_lower:
-            return "🎵 I'm RoomScout AI, focused on housing! While I can't recommend music/art venues, I can help you find apartments in cultural neighborhoods like Jamaica Plain or the South End. What's your budget? 🏠"
-        elif 'books' in message_lower or 'reading' in message_lower:
-            return "📚 I'm RoomScout AI, your housing specialist! While I can't recommend books, I can help you find apartments near libraries and bookstores. What's your budget? Many places have quiet study spaces! 🏠"
-        elif 'news' in message_lower or 'politics' in message_lower:
-            return "📰 I'm RoomScout AI, focused on housing! While I can't give news updates, I can help you find apartments in neighborhoods with great community engagement. What's your budget? 🏠"
-        else:
-            return "🏠 I'm RoomScout AI, your Boston housing expert! I can help you find apartments, analyze neighborhoods, and give housing advice. What's your budget or preferred neighborhood? I know great places across all of Boston's diverse neighborhoods! 🏠"
+        return next(
+            (response for keywords, response in HOUSING_REDIRECT_RESPONSES
+             if any(keyword in message_lower for keyword in keywords)),
+            HOUSING_REDIRECT_DEFAULT
+        )
+
+    @staticmethod
+    def _housing_api_cache_key(params: Dict[str, Any]) -> tuple:
+        return tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value) for key, value in params.items()
+        ))
+    
+    def _cache_housing_api_response(self, cache_key: tuple, response: httpx.Response) -> Optional[Dict[str, Any]]:
+        if response.status_code != 200:
+            logger.warning(f"Failed to fetch housing listings: {response.status_code}")
+            return None
+        
+        data = orjson.loads(response.content)
+        _intern_listing_fields(data.get('listings') or [])
+        with housing_api_cache_lock:
+            housing_api_cache[cache_key] = data
+        return data
+
+    def _get_housing_api(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """GET /api/housing through the response cache - None if the Express API doesn't return 200"""
+        cache_key = self._housing_api_cache_key(params)
+        with housing_api_cache_lock:
+            data = housing_api_cache.get(cache_key)
+        if data is not None:
+            return data
+        
+        return self._cache_housing_api_response(cache_key, express_client.get('/api/housing', params=params))
+
+    async def _aget_housing_api(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Async GET /api/housing sharing the response cache with _get_housing_api"""
+        cache_key = self._housing_api_cache_key(params)
+        with housing_api_cache_lock:
+            data = housing_api_cache.get(cache_key)
+        if data is not None:
+            return data
+        
+        response = await express_async_client.get('/api/housing', params=params)
+        return self._cache_housing_api_response(cache_key, response)
+
+    def get_housing_api_many(self, params_list: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Run several independent /api/housing lookups concurrently - results stay in input order"""
+        if len(params_list) <= 1:
+            return [self._get_housing_api(params) for params in params_list]
+        
+        async def gather_all():
+            return await asyncio.gather(*(self._aget_housing_api(params) for params in params_list))
+        
+        return run_async(gather_all())
 
     def _fetch_housing_listings(self, max_price: int = None, neighborhood: str = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Fetch housing listings from the Express API"""
@@ -1493,18 +2204,11 @@ class RoomScoutPipeline:
                 params['location'] = neighborhood
             
             # Make request to Express API
-            express_api_url = os.getenv('EXPRESS_API_URL', 'http://localhost:5000')
-            response = requests.get(
-                f"{express_api_url}/api/housing",
-                params=params,
-                timeout=30  # Increased from 10 to 30 seconds
-            )
+            data = self._get_housing_api(params)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 return data.get('listings', [])
             else:
-                logger.warning(f"Failed to fetch housing listings: {response.status_code}")
                 return []
                 
         except Exception as e:
@@ -1517,9 +2221,7 @@ class RoomScoutPipeline:
             # Always try to use AI parsing when available, even in development mode
             if self.search_query_chain:
                 # Use AI to parse the query
-                parsed_criteria = self.search_query_chain.invoke({"user_query": user_query})
-                logger.info(f"🤖 AI parsed search criteria: {parsed_criteria}")
-                return parsed_criteria
+                return self.search_query_cache.get_or_compute(user_query, self._parse_search_query_llm)
             else:
                 # Fallback to keyword-based parsing only if AI chains not available
                 logger.info("🔧 Falling back to keyword-based parsing")
@@ -1528,14 +2230,99 @@ class RoomScoutPipeline:
             logger.error(f"Error parsing search query with AI: {e}")
             return self._parse_search_query_dev(user_query)
 
+    def _parse_search_query_llm(self, user_query: str) -> Dict[str, Any]:
+        # query_type is emitted first, so once a second key appears it is final
+        # and anything other than HOUSING_SEARCH needs no criteria
+        parsed_criteria = self._stream_json_chain(
+            self.search_query_chain,
+            {"user_query": user_query},
+            stop_early=lambda partial: len(partial) > 1 and partial.get('query_type') != 'HOUSING_SEARCH'
+        )
+        logger.info(f"🤖 AI parsed search criteria: {parsed_criteria}")
+        return parsed_criteria
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts for the message result caches, plus static prompt prefix sizes"""
+        return {
+            "classification": self.classification_cache.stats(),
+            "extraction": self.extraction_cache.stats(),
+            "search_query": self.search_query_cache.stats(),
+            "prompt_prefix_tokens": static_prefix_token_stats()
+        }
+
+    def stream_search_query(self, user_query: str):
+        """Yield progressively parsed search criteria as the AI emits them"""
+        if self.search_query_chain:
+            try:
+                streamed = False
+                for partial in self.search_query_chain.stream({"user_query": user_query}):
+                    streamed = True
+                    yield partial
+                if streamed:
+                    return
+            except Exception as e:
+                logger.error(f"Error streaming search query parse: {e}")
+        yield self._parse_search_query_dev(user_query)
+
+    def stream_classification(self, message: str):
+        """Yield the classifier's reasoning as {"delta": ...} chunks, then the final classification"""
+        result = self.classification_cache.get(message)
+        if result is None:
+            try:
+                result = self._classify_without_llm(message)
+                if result is None:
+                    chunks = []
+                    for chunk in self.classification_llm.stream(classification_messages(message)):
+                        if chunk.content:
+                            chunks.append(chunk.content)
+                            yield {"delta": chunk.content}
+                    result = self._ai_classification_result("".join(chunks))
+            except Exception as e:
+                result = self._classification_error(e)
+            if self._is_cacheable_classification(result):
+                self.classification_cache.put(message, result)
+        yield result
+
+    def stream_chat_response(self, message: str, context: str = ""):
+        """Yield the chat response as text chunks while the AI generates it"""
+        context = bound_chat_context(context)
+        if self.chat_chain:
+            try:
+                streamed = False
+                for chunk in self.chat_chain.stream({"user_message": message, "context": context}):
+                    streamed = True
+                    yield chunk
+                if streamed:
+                    return
+            except Exception as e:
+                logger.error(f"Error streaming chat response: {e}")
+                if streamed:
+                    return
+        yield self.generate_ai_chat_response(message, context)["response"]
+
+    def _stream_json_chain(self, chain, inputs: Dict[str, Any], stop_early=None) -> Dict[str, Any]:
+        """
+        Consume a structured-output chain as a stream and return the last parsed object.
+        stop_early(partial) can end generation as soon as the caller has what it needs.
+        """
+        result = None
+        for partial in chain.stream(inputs):
+            result = partial
+            if stop_early and isinstance(partial, dict) and stop_early(partial):
+                break
+        if result is None:
+            raise ValueError("LLM output contained no parseable JSON")
+        return result
+
     def _parse_search_query_dev(self, user_query: str) -> Dict[str, Any]:
-        """Development mode parsing - simple keyword extraction"""
-        import re
-        
-        query_lower = user_query.lower()
-        
+        """Development mode parsing - simple keyword extraction, memoized per normalized query"""
+        return copy.deepcopy(self._parse_search_query_keywords(user_query.strip().lower()))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_search_query_keywords(query_lower: str) -> Dict[str, Any]:
         # Extract budget information
-        budget_match = re.search(r'\$?(\d+)', user_query)
+        budget_match = BUDGET_RE.search(query_lower)
         budget_amount = int(budget_match.group(1)) if budget_match else None
         
         budget_info = {
@@ -1546,32 +2333,17 @@ class RoomScoutPipeline:
         }
         
         if budget_amount:
-            if any(word in query_lower for word in ['above', 'over', 'more than']):
-                budget_info["min"] = budget_amount
-                budget_info["range_type"] = "above"
-            elif any(word in query_lower for word in ['below', 'under', 'less than']):
-                budget_info["max"] = budget_amount
-                budget_info["range_type"] = "below"
-            elif any(word in query_lower for word in ['around', 'about', 'approximately']):
-                budget_info["target"] = budget_amount
-                budget_info["range_type"] = "around"
-            else:
-                budget_info["max"] = budget_amount
-                budget_info["range_type"] = "below"
+            # A bare amount is treated as a maximum
+            ranges = {BUDGET_QUALIFIER_RANGES[word] for word in BUDGET_QUALIFIER_RE.findall(query_lower)}
+            range_type = next((name for name in BUDGET_RANGE_FIELDS if name in ranges), "below")
+            budget_info[BUDGET_RANGE_FIELDS[range_type]] = budget_amount
+            budget_info["range_type"] = range_type
         
         # Extract location information
-        neighborhoods = []
-        if 'mission hill' in query_lower:
-            neighborhoods.append('Mission Hill')
-        if 'back bay' in query_lower:
-            neighborhoods.append('Back Bay')
-        if 'fenway' in query_lower:
-            neighborhoods.append('Fenway')
-        if 'roxbury' in query_lower:
-            neighborhoods.append('Roxbury')
+        neighborhoods = [name for name in DEV_NEIGHBORHOODS if name.lower() in query_lower]
         
         proximity = None
-        if any(word in query_lower for word in ['near neu', 'close to campus', 'campus']):
+        if 'campus' in query_lower or 'near neu' in query_lower:
             proximity = "near NEU"
         
         return {
@@ -1640,15 +2412,9 @@ class RoomScoutPipeline:
                 params['amenities'] = amenities
             
             # Make request to Express API
-            express_api_url = os.getenv('EXPRESS_API_URL', 'http://localhost:5000')
-            response = requests.get(
-                f"{express_api_url}/api/housing",
-                params=params,
-                timeout=30  # Increased from 10 to 30 seconds
-            )
+            data = self._get_housing_api(params)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 return {
                     'listings': data.get('listings', []),
                     'total': data.get('total', 0),
@@ -1659,7 +2425,6 @@ class RoomScoutPipeline:
                     'hasPrevPage': data.get('page', page) > 1
                 }
             else:
-                logger.warning(f"Failed to fetch housing listings: {response.status_code}")
                 return {
                     'listings': [],
                     'total': 0,
@@ -1692,22 +2457,36 @@ class RoomScoutPipeline:
             has_next = search_result.get('hasNextPage', False)
             has_prev = search_result.get('hasPrevPage', False)
             
+            # Nothing for the model to describe - the templated no-results reply is just as good
+            if not listings:
+                logger.info("🔧 No listings found, skipping AI response generation")
+                return self._generate_search_response_dev(original_query, search_criteria, search_result)
+            
             # Always try to use AI response generation when available
             if self.search_response_chain:
+                cache_key = self._search_response_cache_key(original_query, search_criteria, listings)
+                with cache_lock:
+                    cached_response = search_response_cache.get(cache_key)
+                if cached_response is not None:
+                    logger.info("⚡ Returning cached AI response for search results")
+                    return cached_response
+                
                 # Use AI to generate response
                 logger.info("🤖 Generating AI-powered response about search results")
                 response = self.search_response_chain.invoke({
                     "original_query": original_query,
-                    "search_criteria": json.dumps(search_criteria, indent=2),
+                    "search_criteria": _prompt_json(search_criteria),
                     "result_count": len(listings),
                     "total_results": total,
                     "current_page": page,
                     "total_pages": total_pages,
                     "has_next_page": has_next,
                     "has_prev_page": has_prev,
-                    "housing_listings": json.dumps(listings, indent=2)
+                    "housing_listings": _prompt_json([_slim_listing(listing) for listing in listings])
                 })
-                return response.content
+                with cache_lock:
+                    search_response_cache[cache_key] = response
+                return response
             else:
                 # Fallback to development response only if AI chains not available
                 logger.info("🔧 Generating development mode response")
@@ -1716,6 +2495,16 @@ class RoomScoutPipeline:
             logger.error(f"Error generating search response with AI: {e}")
             return self._generate_search_response_dev(original_query, search_criteria, search_result)
 
+    def _search_response_cache_key(self, original_query: str, search_criteria: Dict[str, Any], listings: List[Dict[str, Any]]) -> bytes:
+        """Content hash of the query, criteria and listing ids used to key the AI response cache"""
+        listing_ids = ''.join(sorted(str(listing.get('_id', '')) for listing in listings[:10]))
+        key_source = b'\x00'.join((
+            original_query.encode(),
+            orjson.dumps(search_criteria, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+            listing_ids.encode()
+        ))
+        return hashlib.blake2b(key_source, digest_size=16).digest()
+
     def _generate_search_response_dev(self, original_query: str, search_criteria: Dict[str, Any], search_result: Dict[str, Any]) -> str:
         """Development mode - generate smart response about search results with pagination"""
         listings = search_result.get('listings', [])
@@ -1729,31 +2518,34 @@ class RoomScoutPipeline:
         location = search_criteria.get('location', {})
         
         if listings and len(listings) > 0:
-            response = f"🏠 **Found {total} housing option(s) for your search!**\n\n"
-            response += f"📄 **Page {page} of {total_pages}**\n\n"
+            # Collect the pieces and join once rather than re-copying the response on every +=
+            parts = [SEARCH_RESULTS_HEADER_TEMPLATE.format_map({'total': total, 'page': page, 'total_pages': total_pages})]
             
             for i, listing in enumerate(listings, 1):
-                response += f"**{i}. {listing.get('title', 'Housing Listing')}**\n"
-                response += f"   💰 ${listing.get('price', 0):,}/month\n"
-                response += f"   📍 {listing.get('location', {}).get('neighborhood', 'Boston')}\n"
-                response += f"   🏘️ {listing.get('propertyType', 'apartment')} • {listing.get('bedrooms', 1)}BR • {listing.get('bathrooms', 1)}BA\n"
-                if listing.get('amenities'):
-                    amenities = listing['amenities'][:2]
-                    response += f"   ✨ {', '.join(amenities)}\n"
-                response += "\n"
+                amenities = listing.get('amenities')
+                amenities_line = f"   ✨ {', '.join(amenities[:2])}\n" if amenities else ""
+                # One f-string per listing - rendered in a single pass with no intermediate concatenations
+                parts.append(
+                    f"**{i}. {listing.get('title', 'Housing Listing')}**\n"
+                    f"   💰 ${listing.get('price', 0):,}/month\n"
+                    f"   📍 {listing.get('location', {}).get('neighborhood', 'Boston')}\n"
+                    f"   🏘️ {listing.get('propertyType', 'apartment')} • {listing.get('bedrooms', 1)}BR • {listing.get('bathrooms', 1)}BA\n"
+                    f"{amenities_line}\n"
+                )
             
             # Add pagination controls
-            response += "📱 **Navigation:**\n"
+            parts.append("📱 **Navigation:**\n")
             if has_prev:
-                response += f"   ⬅️ **Previous Page** (Page {page-1})\n"
+                parts.append(f"   ⬅️ **Previous Page** (Page {page-1})\n")
             if has_next:
-                response += f"   ➡️ **Next Page** (Page {page+1})\n"
+                parts.append(f"   ➡️ **Next Page** (Page {page+1})\n")
             
             if total_pages > 1:
-                response += f"\n💡 **Showing {len(listings)} of {total} listings**\n"
-                response += "Use the navigation above or ask me to show specific pages!"
+                parts.append(f"\n💡 **Showing {len(listings)} of {total} listings**\nUse the navigation above or ask me to show specific pages!")
             else:
-                response += "\n💡 **All listings shown** - Use filters to narrow down your search!"
+                parts.append("\n💡 **All listings shown** - Use filters to narrow down your search!")
+            
+            response = "".join(parts)
             
         else:
             # No results found
@@ -1767,13 +2559,7 @@ class RoomScoutPipeline:
             if location.get('neighborhoods'):
                 location_info = f" in {', '.join(location['neighborhoods'])}"
             
-            response = f"💰 I searched for housing {budget_info}{location_info}, but I couldn't find any current listings matching your criteria.\n\n"
-            response += "**Here's what you can try:**\n"
-            response += "• Adjust your budget range\n"
-            response += "• Try different neighborhoods\n"
-            response += "• Look for shared rooms or roommate situations\n"
-            response += "• Check for utilities-included options\n\n"
-            response += "Want me to search with different criteria?"
+            response = NO_SEARCH_RESULTS_TEMPLATE.format_map({'budget_info': budget_info, 'location_info': location_info})
         
         return response
 
@@ -1826,6 +2612,11 @@ class RoomScoutPipeline:
         Save extracted listing to database via Express API
         """
         try:
+            # Lowercase once - the neighborhood/room/amenity helpers all match on lowercased text
+            location_lower = (extracted_data.get('location') or '').lower()
+            room_type_lower = (extracted_data.get('room_type') or '').lower()
+            notes_lower = (extracted_data.get('additional_notes') or '').lower()
+            
             # Prepare listing data for database storage
             listing_data = {
                 "title": f"Housing Listing - {extracted_data.get('location', 'Boston')}",
@@ -1837,14 +2628,14 @@ class RoomScoutPipeline:
                     "city": "Boston",
                     "state": "MA",
                     "zipCode": "02120",
-                    "neighborhood": self._extract_neighborhood(extracted_data.get('location', '')),
-                    "walkTimeToNEU": self._estimate_walk_time(extracted_data.get('location', '')),
-                    "transitTimeToNEU": self._estimate_transit_time(extracted_data.get('location', ''))
+                    "neighborhood": self._extract_neighborhood(location_lower),
+                    "walkTimeToNEU": self._estimate_walk_time(location_lower),
+                    "transitTimeToNEU": self._estimate_transit_time(location_lower)
                 },
-                "bedrooms": self._extract_bedroom_count(extracted_data.get('room_type', '')),
+                "bedrooms": self._extract_bedroom_count(room_type_lower),
                 "bathrooms": 1,  # Default
-                "propertyType": self._determine_property_type(extracted_data.get('room_type', '')),
-                "roomType": self._map_room_type(extracted_data.get('room_type', '')),
+                "propertyType": self._determine_property_type(room_type_lower),
+                "roomType": self._map_room_type(room_type_lower),
                 "availability": {
                     "startDate": self._parse_availability_date(extracted_data.get('availability_date', '')),
                     "isAvailable": True
@@ -1852,7 +2643,7 @@ class RoomScoutPipeline:
                 "leaseTerms": {
                     "minLease": 12,
                     "deposit": 0,
-                    "utilitiesIncluded": "utilities" in (extracted_data.get('additional_notes', '') or '').lower()
+                    "utilitiesIncluded": "utilities" in notes_lower
                 },
                 "contactInfo": {
                     "phone": extracted_data.get('contact_info', ''),
@@ -1860,7 +2651,7 @@ class RoomScoutPipeline:
                     "preferredContact": "phone",
                     "responseTime": "within_day"
                 },
-                "amenities": self._extract_amenities(extracted_data.get('additional_notes', '')),
+                "amenities": self._extract_amenities(notes_lower),
                 "northeasternFeatures": {
                     "shuttleAccess": False,
                     "bikeFriendly": True,
@@ -1896,14 +2687,15 @@ class RoomScoutPipeline:
                 "views": 0,
                 "favorites": [],
                 "tags": ["ai-extracted", "whatsapp"],
-                "createdAt": datetime.now().isoformat(),
-                "updatedAt": datetime.now().isoformat()
+                "createdAt": iso_now(),
+                "updatedAt": iso_now()
             }
             
             # Save to database via Express API with retry logic
-            express_api_url = os.getenv('EXPRESS_API_URL', 'http://localhost:5000')
-            logger.info(f"💾 Attempting to save listing to database via {express_api_url}/api/housing/ai-extracted")
-            logger.info(f"📊 Listing data: {json.dumps(listing_data, indent=2)}")
+            logger.info(f"💾 Attempting to save listing to database via {EXPRESS_API_URL}/api/housing/ai-extracted")
+            # Serialized once with orjson - logged and then re-sent as-is on every retry
+            listing_body = orjson.dumps(listing_data)
+            logger.info(f"📊 Listing data: {listing_body.decode()}")
             
             # Retry logic with exponential backoff
             max_retries = 3
@@ -1911,18 +2703,17 @@ class RoomScoutPipeline:
             
             for attempt in range(max_retries):
                 try:
-                    response = requests.post(
-                        f"{express_api_url}/api/housing/ai-extracted",
-                        json=listing_data,
-                        timeout=30,
-                        headers={'Content-Type': 'application/json'}
+                    response = express_client.post(
+                        '/api/housing/ai-extracted',
+                        content=listing_body,
+                        headers=JSON_HEADERS
                     )
                     
                     logger.info(f"📡 Database save response (attempt {attempt + 1}): {response.status_code}")
                     logger.info(f"📄 Response content: {response.text[:500]}")
                     
                     if response.status_code == 201 or response.status_code == 200:
-                        saved_listing = response.json()
+                        saved_listing = orjson.loads(response.content)
                         logger.info(f"✅ Successfully saved extracted listing to database: {saved_listing.get('listing', 'unknown')}")
                         return {
                             "success": True,
@@ -1948,7 +2739,7 @@ class RoomScoutPipeline:
                             "error": f"Database save failed: {response.status_code} - {response.text}"
                         }
                         
-                except requests.exceptions.RequestException as e:
+                except httpx.HTTPError as e:
                     if attempt < max_retries - 1:
                         delay = base_delay * (2 ** attempt)
                         logger.warning(f"⚠️ Request failed (attempt {attempt + 1}), retrying in {delay} seconds: {e}")
@@ -1972,36 +2763,27 @@ class RoomScoutPipeline:
         """Extract numeric price from price string"""
         if not price_str:
             return 0
-        import re
-        match = re.search(r'\$?(\d+(?:,\d{3})*)', price_str)
+        match = PRICE_NUMBER_RE.search(price_str)
         if match:
             return int(match.group(1).replace(',', ''))
         return 0
     
-    def _extract_neighborhood(self, location: str) -> str:
-        """Extract neighborhood from location string"""
-        if not location:
+    def _extract_neighborhood(self, location_lower: str) -> str:
+        """Extract neighborhood from a lowercased location string"""
+        if not location_lower:
             return "Fenway"
         
-        neighborhoods = [
-            "Fenway", "Roxbury", "Dorchester", "Jamaica Plain", "Allston", 
-            "Brighton", "Cambridge", "Somerville", "Medford", "Brookline",
-            "Back Bay", "South End", "North End", "Beacon Hill", "Charlestown"
-        ]
-        
-        location_lower = location.lower()
-        for neighborhood in neighborhoods:
-            if neighborhood.lower() in location_lower:
+        for neighborhood_lower, neighborhood in LISTING_NEIGHBORHOODS:
+            if neighborhood_lower in location_lower:
                 return neighborhood
         
         return "Fenway"  # Default to Fenway if no match
     
-    def _estimate_walk_time(self, location: str) -> int:
-        """Estimate walk time to NEU based on location"""
-        if not location:
+    def _estimate_walk_time(self, location_lower: str) -> int:
+        """Estimate walk time to NEU based on a lowercased location"""
+        if not location_lower:
             return 20
         
-        location_lower = location.lower()
         if "mission hill" in location_lower:
             return 8
         elif "fenway" in location_lower:
@@ -2013,12 +2795,11 @@ class RoomScoutPipeline:
         else:
             return 20
     
-    def _estimate_transit_time(self, location: str) -> int:
-        """Estimate transit time to NEU based on location"""
-        if not location:
+    def _estimate_transit_time(self, location_lower: str) -> int:
+        """Estimate transit time to NEU based on a lowercased location"""
+        if not location_lower:
             return 30
         
-        location_lower = location.lower()
         if "mission hill" in location_lower:
             return 5
         elif "fenway" in location_lower:
@@ -2030,12 +2811,11 @@ class RoomScoutPipeline:
         else:
             return 15
     
-    def _extract_bedroom_count(self, room_type: str) -> int:
-        """Extract bedroom count from room type"""
-        if not room_type:
+    def _extract_bedroom_count(self, room_type_lower: str) -> int:
+        """Extract bedroom count from a lowercased room type"""
+        if not room_type_lower:
             return 1
         
-        room_type_lower = room_type.lower()
         if "studio" in room_type_lower:
             return 0
         elif "1br" in room_type_lower or "1 bedroom" in room_type_lower:
@@ -2047,12 +2827,11 @@ class RoomScoutPipeline:
         else:
             return 1
     
-    def _determine_property_type(self, room_type: str) -> str:
-        """Determine property type from room type"""
-        if not room_type:
+    def _determine_property_type(self, room_type_lower: str) -> str:
+        """Determine property type from a lowercased room type"""
+        if not room_type_lower:
             return "apartment"
         
-        room_type_lower = room_type.lower()
         if "studio" in room_type_lower:
             return "studio"
         elif "house" in room_type_lower:
@@ -2065,7 +2844,7 @@ class RoomScoutPipeline:
     def _parse_availability_date(self, availability: str) -> str:
         """Parse availability date string and return ISO format"""
         if not availability:
-            return datetime.now().isoformat()
+            return iso_now()
         
         # Simple date parsing - can be enhanced
         availability_lower = availability.lower()
@@ -2078,15 +2857,14 @@ class RoomScoutPipeline:
         elif "december" in availability_lower or "dec" in availability_lower:
             return datetime(2024, 12, 1).isoformat()
         else:
-            return datetime.now().isoformat()
+            return iso_now()
     
-    def _extract_amenities(self, notes: str) -> List[str]:
-        """Extract amenities from additional notes"""
-        if not notes:
+    def _extract_amenities(self, notes_lower: str) -> List[str]:
+        """Extract amenities from lowercased additional notes"""
+        if not notes_lower:
             return []
         
         amenities = []
-        notes_lower = notes.lower()
         
         if "furnished" in notes_lower:
             amenities.append("furnished")
@@ -2111,12 +2889,11 @@ class RoomScoutPipeline:
         
         return amenities
 
-    def _map_room_type(self, room_type: str) -> str:
-        """Map room type to a standardized format"""
-        if not room_type:
+    def _map_room_type(self, room_type_lower: str) -> str:
+        """Map a lowercased room type to a standardized format"""
+        if not room_type_lower:
             return "1BR"
             
-        room_type_lower = room_type.lower()
         if "studio" in room_type_lower:
             return "studio"
         elif "1br" in room_type_lower or "1 bedroom" in room_type_lower:
@@ -2136,7 +2913,7 @@ class RoomScoutPipeline:
         else:
             return "1BR"  # Default to 1BR
 
-# Initialize pipeline
+# Initialize pipeline - the one instance shared by these routes and app.py
 pipeline = RoomScoutPipeline()
 
 # Flask routes
@@ -2147,12 +2924,12 @@ def health_check():
         "status": "healthy",
         "service": "RoomScout AI Python API",
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": iso_now(),
         "development_mode": os.getenv('DEVELOPMENT_MODE', 'false').lower() == 'true',
         "model_used": MODEL_NAME if pipeline.llm else "simulated",
         "openai_configured": pipeline.ai_available,
         "ai_chains_available": pipeline.ai_available,
-        "metrics": pipeline.metrics
+        "metrics": pipeline.get_metrics()
     })
 
 @app.route('/process', methods=['POST'])
@@ -2182,15 +2959,12 @@ def batch_process():
         if not messages:
             return jsonify({"error": "No messages provided"}), 400
         
-        results = []
-        for message in messages:
-            result = pipeline.process_message(message)
-            results.append(result)
+        results = pipeline.process_messages(messages)
         
         return jsonify({
             "results": results,
             "total_processed": len(results),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now(),
             "development_mode": os.getenv('DEVELOPMENT_MODE', 'false').lower() == 'true',
             "model_used": MODEL_NAME if pipeline.llm else "simulated"
         })
@@ -2199,6 +2973,52 @@ def batch_process():
         logger.error(f"Error in batch processing: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/batch-extract', methods=['POST'])
+def batch_extract():
+    """Extract housing data from multiple messages with concurrent LLM calls"""
+    try:
+        data = request.get_json()
+        messages = data.get('messages', [])
+        
+        if not messages:
+            return jsonify({"error": "No messages provided"}), 400
+        
+        results = run_async(pipeline.abatch_extract_housing_data(messages))
+        
+        return jsonify({
+            "results": results,
+            "total_processed": len(results),
+            "timestamp": iso_now(),
+            "model_used": MODEL_NAME if pipeline.llm else "simulated"
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in batch extraction: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/batch-classify', methods=['POST'])
+def batch_classify():
+    """Classify multiple messages with concurrent LLM calls"""
+    try:
+        data = request.get_json()
+        messages = data.get('messages', [])
+        
+        if not messages:
+            return jsonify({"error": "No messages provided"}), 400
+        
+        results = run_async(pipeline.abatch_classify_messages(messages))
+        
+        return jsonify({
+            "results": results,
+            "total_processed": len(results),
+            "timestamp": iso_now(),
+            "model_used": MODEL_NAME if pipeline.llm else "simulated"
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in batch classification: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/security-test', methods=['POST'])
 def security_test():
     """Test security hardening"""
@@ -2245,11 +3065,22 @@ def get_metrics():
             "/health",
             "/process",
             "/batch-process",
+            "/batch-extract",
+            "/batch-classify",
             "/security-test",
-            "/metrics"
+            "/metrics",
+            "/cache-stats",
+            "/chat-stream",
+            "/classify-stream",
+            "/parse-query-stream"
         ]
     })
 
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """Get hit rates of the message result caches"""
+    return jsonify(pipeline.get_cache_stats())
+
 @app.route('/chat-query', methods=['POST'])
 def chat_query():
     """AI-powered conversational chat using LangChain"""
@@ -2268,11 +3099,7 @@ def chat_query():
         ai_result = pipeline.generate_ai_chat_response(message, context)
         
         # Update metrics
-        pipeline.metrics["total_requests"] += 1
-        pipeline.metrics["successful_requests"] += 1
-        pipeline.metrics["ai_requests"] += 1 if ai_result.get("ai_generated", False) else 0
-        pipeline.metrics["fallback_requests"] += 1 if not ai_result.get("ai_generated", False) else 0
-        pipeline.metrics["last_request_time"] = datetime.now().isoformat()
+        pipeline.record_request(success=True, ai_generated=ai_result.get("ai_generated", False))
         
         return jsonify({
             "response": ai_result["response"],
@@ -2280,22 +3107,64 @@ def chat_query():
             "data": ai_result.get("data"),
             "suggestions": ai_result["suggestions"],
             "ai_generated": ai_result.get("ai_generated", False),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
         
     except Exception as e:
         logger.error(f"Error in AI chat query: {e}")
-        pipeline.metrics["total_requests"] += 1
-        pipeline.metrics["failed_requests"] += 1
+        pipeline.record_request(success=False)
         
         return jsonify({
-            "response": "Hey! 😅 I hit a technical snag, but I'm still here to help! What kind of housing are you looking for near NEU?",
+            "response": CHAT_ERROR_RESPONSE,
             "type": "error_recovery",
-            "suggestions": ["Find budget apartments", "Get neighborhood info", "Upload WhatsApp file"],
+            "suggestions": CHAT_ERROR_SUGGESTIONS,
             "ai_generated": False,
             "error": str(e)
         }), 500
 
+@app.route('/chat-stream', methods=['POST'])
+def chat_stream():
+    """Stream the conversational AI response as plain text"""
+    data = request.get_json()
+    message = data.get('message', '')
+    context = data.get('context', '')
+    
+    if not message:
+        return jsonify({"error": "No message provided"}), 400
+    
+    logger.info(f"💬 AI Chat stream: {message[:50]}...")
+    return Response(stream_with_context(pipeline.stream_chat_response(message, context)), mimetype='text/plain')
+
+@app.route('/classify-stream', methods=['POST'])
+def classify_stream():
+    """Stream the classification reasoning as server-sent events, ending with the full result"""
+    data = request.get_json()
+    message = data.get('message', '')
+    
+    if not message:
+        return jsonify({"error": "No message provided"}), 400
+    
+    def generate():
+        for event in pipeline.stream_classification(message):
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+@app.route('/parse-query-stream', methods=['POST'])
+def parse_query_stream():
+    """Stream partially parsed search criteria as server-sent events"""
+    data = request.get_json()
+    query = data.get('query') or data.get('message', '')
+    
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+    
+    def generate():
+        for partial in pipeline.stream_search_query(query):
+            yield b"data: " + orjson.dumps(partial) + b"\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
 @app.route('/extract-and-save', methods=['POST'])
 def extract_and_save():
     """Extract housing data and save to database"""
@@ -2314,17 +3183,26 @@ def extract_and_save():
             "success": True,
             "extraction_result": result,
             "saved_to_database": result.get("saved_to_database", False),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         })
         
     except Exception as e:
         logger.error(f"Error in extract and save: {e}")
         return jsonify({"error": str(e)}), 500
 
+# WSGI entry point for gunicorn (see gunicorn_conf.py)
+application = app
+
 if __name__ == '__main__':
     logger.info("Starting RoomScout AI Python API...")
     logger.info(f"Development mode: {False}") # Always False now
     logger.info(f"Model: {MODEL_NAME if pipeline.llm else 'simulated'}")
     logger.info(f"OpenAI configured: {pipeline.llm is not None}")
     logger.info("Based on Assignments 6, 7, and 8 with security hardening")
-    app.run(host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
+    
+    # Werkzeug's reloader/debugger only for local development; waitress otherwise
+    if os.getenv('FLASK_ENV') == 'development':
+        app.run(host='0.0.0.0', port=5001, debug=True)
+    else:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5001, threads=int(os.getenv('THREADS', '8')))
@@ -70,7 +70,7 @@ echo "  GET  /metrics - Get performance metrics"
 echo "  POST /batch-process - Process multiple messages"
 echo ""
 echo "💡 Token Optimization Features:"
-echo "  - Development mode: Uses gpt-3.5-turbo instead of gpt-4o-mini"
+echo "  - Model: gpt-4o-mini with automatic prompt caching (override with OPENAI_MODEL)"
 echo "  - Reduced max_tokens: 500 instead of 1000"
 echo "  - LangSmith tracing disabled in dev mode"
 echo "  - Simulated responses for testing"